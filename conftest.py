@@ -0,0 +1,12 @@
+"""
+🐱‍👻 GhostKitty StemSplitter - Shared test fixtures
+"""
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def splitter():
+    """One CPU GhostKittyStemSplitter shared by every test in a worker"""
+    ghostkitty = pytest.importorskip("ghostkitty")
+    return ghostkitty.GhostKittyStemSplitter(device="cpu")
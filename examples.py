@@ -4,9 +4,11 @@
 Demonstrates various ways to use the stem splitter
 """
 
+import functools
 import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 from ghostkitty import GhostKittyStemSplitter
 
@@ -14,13 +16,21 @@ from ghostkitty import GhostKittyStemSplitter
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
+@functools.lru_cache(maxsize=None)
+def get_splitter(
+    model_name: str = "htdemucs", device: Optional[str] = None
+) -> GhostKittyStemSplitter:
+    """Return a shared splitter so each model is only loaded once"""
+    return GhostKittyStemSplitter(model_name=model_name, device=device)
+
+
 def example_basic_usage():
     """Example 1: Basic stem splitting"""
     print("📁 Example 1: Basic Usage")
     print("=" * 50)
 
-    # Create splitter with default settings
-    splitter = GhostKittyStemSplitter()
+    # Get splitter with default settings
+    splitter = get_splitter()
 
     # Example file (you'll need to provide your own)
     audio_file = Path("example_song.mp3")  # Replace with your audio file
@@ -44,8 +54,8 @@ def example_custom_settings():
     print("\n🤖 Example 2: Custom Settings")
     print("=" * 50)
 
-    # Create splitter with high-quality model
-    splitter = GhostKittyStemSplitter(
+    # Get splitter with high-quality model
+    splitter = get_splitter(
         model_name="htdemucs_ft",  # Higher quality model
         device="cpu",  # Force CPU usage
     )
@@ -70,7 +80,7 @@ def example_batch_processing():
     music_dir = Path("sample_music")
 
     if music_dir.exists() and any(music_dir.iterdir()):
-        splitter = GhostKittyStemSplitter()
+        splitter = get_splitter()
 
         # Process all audio files in the directory
         success_count = splitter.batch_split(
@@ -103,7 +113,7 @@ def example_programmatic_usage():
         audio_files.extend(Path(".").glob(pattern))
 
     if audio_files:
-        splitter = GhostKittyStemSplitter()
+        splitter = get_splitter()
 
         for audio_file in audio_files[:3]:  # Process first 3 files
             print(f"🎵 Processing: {audio_file.name}")
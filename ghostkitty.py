@@ -12,17 +12,33 @@ Splits audio files into 4 stems:
 Supports: MP3, WAV, FLAC, M4A, and more!
 """
 
+import contextlib
+import gc
 import logging
+import math
+import os
+import queue
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Limit CUDA allocator block splitting so long batch runs don't fragment
+# into OOM; must be set before torch initialises CUDA
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "max_split_size_mb:512")
+
+# Run ops MPS doesn't implement on the CPU instead of crashing; torch reads
+# this only once, on import, so entry points must import us before torch
+os.environ.setdefault("PYTORCH_ENABLE_MPS_FALLBACK", "1")
 
 import click
 
 # Audio processing libraries
-import librosa
 import numpy as np
 import soundfile as sf
+import demucs
 import torch
 import torchaudio
 from colorama import Fore, Style, init
@@ -30,7 +46,7 @@ from demucs.apply import apply_model
 from demucs.pretrained import get_model
 
 # UI and progress libraries
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.progress import (
     BarColumn,
@@ -44,48 +60,196 @@ from rich.text import Text
 # Initialize colorama for cross-platform colored output
 init()
 
+# Per-user cache for converted models and the model server
+CACHE_DIR = Path("~/.cache/ghostkitty").expanduser()
+
+# Audio file extensions GhostKitty can split (lowercase)
+SUPPORTED_SUFFIXES = frozenset(
+    {
+        ".mp3",
+        ".wav",
+        ".flac",
+        ".m4a",
+        ".aac",
+        ".ogg",
+        ".opus",
+        ".wma",
+    }
+)
+
+
+# Best device found by detect_device(), probed at most once per process
+_DETECTED_DEVICE: Optional[str] = None
+
+# Result of the MPS availability check, queried from Metal at most once
+_MPS_AVAILABLE: Optional[bool] = None
+
+
+def _probe_cuda() -> Optional[str]:
+    """Return "cuda" if a CUDA device is usable, None otherwise"""
+    try:
+        return "cuda" if torch.cuda.is_available() else None
+    except Exception:
+        # A broken driver install shouldn't stop us falling back
+        return None
+
+
+def mps_available() -> bool:
+    """Return whether Apple Silicon (MPS) acceleration is usable, cached"""
+    global _MPS_AVAILABLE
+    if _MPS_AVAILABLE is None:
+        try:
+            mps = getattr(torch.backends, "mps", None)
+            _MPS_AVAILABLE = bool(mps is not None and mps.is_available())
+        except Exception:
+            _MPS_AVAILABLE = False
+    return _MPS_AVAILABLE
+
+
+def _probe_mps() -> Optional[str]:
+    """Return "mps" if Apple Silicon acceleration is usable, None otherwise"""
+    return "mps" if mps_available() else None
+
+
+def detect_device() -> str:
+    """
+    Auto-detect the best available device
+
+    Accelerators are probed first and CPU is only chosen once they have all
+    failed. The result is cached, so later calls don't probe again.
+
+    Returns:
+        "cuda", "mps" or "cpu"
+    """
+    global _DETECTED_DEVICE
+    if _DETECTED_DEVICE is None:
+        for probe in (_probe_cuda, _probe_mps):
+            device = probe()
+            if device:
+                break
+        else:
+            device = "cpu"
+        _DETECTED_DEVICE = device
+    return _DETECTED_DEVICE
+
+
+def auto_device() -> torch.device:
+    """Return the best available device, trying CUDA, then MPS, then CPU"""
+    return torch.device(detect_device())
+
+
+def filter_supported(paths: Iterable[Path]) -> List[Path]:
+    """
+    Keep only the paths with a supported audio extension
+
+    Args:
+        paths: Candidate file paths
+
+    Returns:
+        The supported paths, in their original order
+    """
+    return [path for path in paths if path.suffix.lower() in SUPPORTED_SUFFIXES]
+
 
 class GhostKittyStemSplitter:
     """
     🐱‍👻 The main GhostKitty StemSplitter class
     """
 
-    def __init__(self, model_name: str = "htdemucs", device: Optional[str] = None):
+    # Lowercase extensions, so checks are one hashed lookup
+    _SUPPORTED = SUPPORTED_SUFFIXES
+
+    # Public name for the same set, kept for existing callers
+    supported_formats = _SUPPORTED
+
+    # Stem names mapping, in the order the model outputs them
+    stem_names = {0: "drums", 1: "bass", 2: "other", 3: "vocals"}
+
+    # Names stems_to_save accepts, "instrumental" is the sum of all but vocals
+    VALID_STEMS = (*stem_names.values(), "instrumental")
+
+    def __init__(
+        self,
+        model_name: str = "htdemucs",
+        device: Union[str, torch.device, None] = "auto",
+        output_format: str = "WAV",
+        output_subtype: str = "PCM_24",
+        stems: Optional[List[str]] = None,
+    ):
         """
         Initialize the GhostKitty StemSplitter
 
         Args:
             model_name: The Demucs model to use ('htdemucs', 'htdemucs_ft', 'mdx_extra', etc.)
-            device: Device to run on ('cpu', 'cuda', 'mps'). Auto-detected if None.
+            device: Device to run on ('cpu', 'cuda', 'cuda:1', 'mps' or a
+                torch.device). Auto-detected if 'auto' or None.
+            output_format: Container for saved stems ('WAV' or 'FLAC')
+            output_subtype: Sample encoding for saved stems ('PCM_16' or 'PCM_24')
+            stems: Stems to save ('vocals', 'drums', 'bass', 'other' or
+                'instrumental' for everything but vocals). All four if None.
         """
         self.console = Console()
         self.model_name = model_name
-        self.device = device or self._detect_device()
+        if device is None or device == "auto":
+            device = self._detect_device()
+        # Stored as a string that keeps the index, e.g. "cuda:1"
+        self.device = str(device)
         self.model = None
-        self.supported_formats = {
-            ".mp3",
-            ".wav",
-            ".flac",
-            ".m4a",
-            ".aac",
-            ".ogg",
-            ".wma",
-        }
-
-        # Stem names mapping
-        self.stem_names = {0: "drums", 1: "bass", 2: "other", 3: "vocals"}
+        self.output_format = output_format.upper()
+        self.output_subtype = output_subtype.upper()
+
+        # Window length and crossfade overlap for chunked inference
+        self.chunk_seconds = 30.0
+        self.overlap_seconds = 1.0
+
+        # Tracks longer than this are streamed from disk block by block
+        self.streaming_threshold_seconds = 600
+
+        # Side stream for host-to-device copies, overlapping them with compute
+        self.copy_stream = (
+            torch.cuda.Stream(self.device) if self.device_type == "cuda" else None
+        )
+
+        # Longest/shortest length ratio allowed within one inference batch
+        self.batch_length_ratio = 1.1
+
+        # Stems to write
+        self.stems_to_save = self.check_stems(stems or self.stem_names.values())
 
         self._setup_logging()
         self._print_banner()
 
+    @property
+    def device_type(self) -> str:
+        """Type of self.device without its index, e.g. 'cuda' for 'cuda:1'"""
+        return torch.device(self.device).type
+
+    @classmethod
+    def check_stems(cls, stems: Iterable[str]) -> List[str]:
+        """
+        Validate stem names, dropping repeats so no file is written twice
+
+        Args:
+            stems: Stem names, see VALID_STEMS
+
+        Returns:
+            The names in their original order, each listed once
+
+        Raises:
+            ValueError: If a name is not in VALID_STEMS
+        """
+        stems = list(dict.fromkeys(stems))
+        unknown = [name for name in stems if name not in cls.VALID_STEMS]
+        if unknown:
+            raise ValueError(
+                f"Unknown stems: {', '.join(unknown)} "
+                f"(choose from {', '.join(cls.VALID_STEMS)})"
+            )
+        return stems
+
     def _detect_device(self) -> str:
         """Auto-detect the best available device"""
-        if torch.cuda.is_available():
-            return "cuda"
-        elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-            return "mps"
-        else:
-            return "cpu"
+        return detect_device()
 
     def _setup_logging(self):
         """Setup logging configuration"""
@@ -132,9 +296,10 @@ class GhostKittyStemSplitter:
                 "[bold green]Loading AI model... 🤖", spinner="dots"
             ):
                 try:
-                    self.model = get_model(self.model_name)
+                    self.model = self._load_pretrained()
                     self.model.to(self.device)
                     self.model.eval()
+                    self._compile_model()
                     self.console.print(
                         "✅ Model loaded successfully!", style="bold green"
                     )
@@ -142,9 +307,130 @@ class GhostKittyStemSplitter:
                     self.console.print(f"❌ Error loading model: {e}", style="bold red")
                     raise
 
+    def _load_pretrained(self):
+        """
+        Load the pretrained model, reusing a local cache of the built module
+
+        get_model parses the bag definition and rebuilds every network from
+        its checkpoint on each call. The built module is pickled once and
+        loaded directly afterwards. The cache is keyed on the demucs version
+        because pickled modules are tied to its class layout.
+        """
+        cache_path = CACHE_DIR / f"{self.model_name}-demucs{demucs.__version__}.pt"
+
+        if cache_path.exists():
+            try:
+                return torch.load(cache_path, map_location="cpu", weights_only=False)
+            except Exception as e:
+                self.logger.warning(
+                    f"Ignoring unreadable model cache {cache_path}: {e}"
+                )
+
+        model = get_model(self.model_name)
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            torch.save(model, tmp_path)
+            tmp_path.replace(cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not cache model to {cache_path}: {e}")
+
+        return model
+
+    def _compile_model(self):
+        """Compile the model's networks with torch.compile when running on CUDA"""
+        if self.device_type != "cuda" or not hasattr(torch, "compile"):
+            return
+
+        # apply_model relies on the BagOfModels wrapper, so compile the
+        # networks inside the bag rather than the bag itself
+        models = getattr(self.model, "models", None)
+        if models is None:
+            return
+        for i, sub_model in enumerate(models):
+            models[i] = torch.compile(sub_model, mode="reduce-overhead", fullgraph=False)
+
+    def _uncompile_model(self) -> bool:
+        """Swap compiled networks back for their eager originals, True if any were"""
+        models = getattr(self.model, "models", None)
+        if models is None:
+            return False
+
+        restored = False
+        for i, sub_model in enumerate(models):
+            # torch.compile wrappers keep the module they were built from
+            original = getattr(sub_model, "_orig_mod", None)
+            if original is not None:
+                models[i] = original
+                restored = True
+        return restored
+
+    def _apply_model(self, chunk: torch.Tensor) -> torch.Tensor:
+        """
+        Run the model on one window, uncompiled if the compiled networks fail
+
+        torch.compile only builds a network on its first call, so a missing
+        Triton or an unsupported op surfaces here rather than in load_model.
+
+        Args:
+            chunk: Tensor of shape [batch, 2, n] on the device
+
+        Returns:
+            Tensor of separated stems [batch, 4, 2, n]
+        """
+        try:
+            return apply_model(self.model, chunk, device=self.device, progress=False)
+        except Exception as e:
+            if not self._uncompile_model():
+                raise
+            self.logger.warning(f"Compiled model failed, running it uncompiled: {e}")
+            return apply_model(self.model, chunk, device=self.device, progress=False)
+
     def is_supported_format(self, file_path: Path) -> bool:
         """Check if file format is supported"""
-        return file_path.suffix.lower() in self.supported_formats
+        return file_path.suffix.lower() in self._SUPPORTED
+
+    def _to_stereo(self, waveform: torch.Tensor) -> torch.Tensor:
+        """Convert a [channels, length] tensor to float32 with exactly 2 channels"""
+        waveform = waveform.float()
+        if waveform.shape[0] == 1:
+            # Convert mono to stereo as a view, without copying the samples
+            waveform = waveform.expand(2, -1)
+        elif waveform.shape[0] > 2:
+            waveform = waveform[:2]  # Take first 2 channels
+        return waveform
+
+    def _decode_ffmpeg(self, file_path: Path) -> Tuple[torch.Tensor, int]:
+        """Decode any format ffmpeg understands to a float32 stereo tensor"""
+        probe = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-select_streams",
+                "a:0",
+                "-show_entries",
+                "stream=sample_rate",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                str(file_path),
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        sample_rate = int(probe.stdout.split()[0])
+
+        # Raw interleaved float32 samples straight from the pipe
+        decoded = subprocess.run(
+            ["ffmpeg", "-v", "error", "-i", str(file_path)]
+            + ["-f", "f32le", "-ac", "2", "-ar", str(sample_rate), "-"],
+            capture_output=True,
+            check=True,
+        )
+        audio = np.frombuffer(decoded.stdout, dtype=np.float32).reshape(-1, 2)
+        return torch.from_numpy(audio.T.copy()), sample_rate
 
     def load_audio(self, file_path: Path) -> Tuple[torch.Tensor, int]:
         """
@@ -159,29 +445,70 @@ class GhostKittyStemSplitter:
         try:
             # Load audio using torchaudio (handles most formats)
             waveform, sample_rate = torchaudio.load(str(file_path))
+            return self._to_stereo(waveform), sample_rate
+        except Exception as e:
+            # Fallback to libsndfile
+            self.logger.warning(f"torchaudio failed, trying soundfile: {e}")
 
-            # Convert to float32 and ensure 2 channels
-            waveform = waveform.float()
-            if waveform.shape[0] == 1:
-                waveform = waveform.repeat(2, 1)  # Convert mono to stereo
-            elif waveform.shape[0] > 2:
-                waveform = waveform[:2]  # Take first 2 channels
-
-            return waveform, sample_rate
+        try:
+            audio, sample_rate = sf.read(
+                str(file_path), dtype="float32", always_2d=True
+            )
+            return self._to_stereo(torch.from_numpy(audio.T)), sample_rate
+        except Exception as e:
+            # Fallback to ffmpeg for formats libsndfile cannot read (e.g. M4A)
+            self.logger.warning(f"soundfile failed, trying ffmpeg: {e}")
 
+        try:
+            return self._decode_ffmpeg(file_path)
         except Exception as e:
-            # Fallback to librosa
-            self.logger.warning(f"torchaudio failed, trying librosa: {e}")
-            try:
-                audio, sr = librosa.load(str(file_path), sr=None, mono=False)
-                if audio.ndim == 1:
-                    audio = np.stack([audio, audio])  # Convert mono to stereo
-                waveform = torch.from_numpy(audio).float()
-                return waveform, sr
-            except Exception as e2:
-                raise Exception(
-                    f"Failed to load audio with both torchaudio and librosa: {e2}"
-                )
+            raise Exception(
+                f"Failed to load audio with torchaudio, soundfile and ffmpeg: {e}"
+            )
+
+    def load_audio_streaming(
+        self, file_path: Path
+    ) -> Iterator[Tuple[torch.Tensor, int]]:
+        """
+        Read an audio file in overlapping inference-window sized blocks
+
+        Only one block is held in memory at a time, independent of the track
+        length. Requires a format libsndfile can read.
+
+        Args:
+            file_path: Path to audio file
+
+        Yields:
+            Tuples of (audio_tensor [2, block_length], start_sample)
+        """
+        with sf.SoundFile(str(file_path)) as f:
+            window, overlap = self._window_size(f.samplerate)
+            start = 0
+            for block in f.blocks(
+                blocksize=window, overlap=overlap, dtype="float32", always_2d=True
+            ):
+                yield self._to_stereo(torch.from_numpy(block.T)), start
+                start += window - overlap
+
+    def _select_stems(self, stems: torch.Tensor) -> torch.Tensor:
+        """
+        Pick the stems listed in stems_to_save
+
+        Args:
+            stems: Tensor containing the separated stems [4, 2, length]
+
+        Returns:
+            Tensor [len(stems_to_save), 2, length], "instrumental" mixed down
+        """
+        stem_index = {name: i for i, name in self.stem_names.items()}
+        selected = []
+        for stem_name in self.stems_to_save:
+            if stem_name == "instrumental":
+                others = [i for name, i in stem_index.items() if name != "vocals"]
+                selected.append(stems[others].sum(dim=0))
+            else:
+                selected.append(stems[stem_index[stem_name]])
+        return torch.stack(selected)
 
     def save_stems(
         self,
@@ -189,6 +516,7 @@ class GhostKittyStemSplitter:
         sample_rate: int,
         output_dir: Path,
         filename_base: str,
+        events: Optional[List[Tuple[str, str]]] = None,
     ):
         """
         Save the separated stems to files
@@ -198,27 +526,347 @@ class GhostKittyStemSplitter:
             sample_rate: Sample rate of audio
             output_dir: Directory to save stems
             filename_base: Base filename without extension
+            events: Collects (message, style) status lines instead of printing
         """
         output_dir.mkdir(parents=True, exist_ok=True)
+        print_events = events is None
+        if print_events:
+            events = []
 
-        # Save each stem
-        for i, stem_name in self.stem_names.items():
-            stem_audio = stems[i].cpu().numpy()
-            output_file = output_dir / f"{filename_base}_{stem_name}.wav"
+        # One device-to-host copy for all stems instead of one per stem
+        stems_np = self._select_stems(stems).detach().cpu().numpy()
+        extension = self.output_format.lower()
+
+        def save_stem(item):
+            i, stem_name = item
+            stem_audio = stems_np[i]
+            output_file = output_dir / f"{filename_base}_{stem_name}.{extension}"
 
             try:
-                sf.write(str(output_file), stem_audio.T, sample_rate, subtype="PCM_24")
-                self.console.print(f"💾 Saved: {stem_name}.wav", style="green")
+                sf.write(
+                    str(output_file),
+                    stem_audio.T,
+                    sample_rate,
+                    subtype=self.output_subtype,
+                    format=self.output_format,
+                )
+                return f"💾 Saved: {stem_name}.{extension}", "green"
             except Exception as e:
-                self.console.print(f"❌ Error saving {stem_name}: {e}", style="red")
+                return f"❌ Error saving {stem_name}: {e}", "red"
+
+        # Stems are independent, so encode and write them in parallel
+        with ThreadPoolExecutor(max_workers=len(self.stems_to_save)) as executor:
+            events.extend(executor.map(save_stem, enumerate(self.stems_to_save)))
+
+        if print_events:
+            self._print_events(events)
 
-    def split_audio(self, input_path: Path, output_dir: Optional[Path] = None) -> bool:
+    def _print_events(self, events: List[Tuple[str, str]]):
+        """Print buffered (message, style) status lines in a single write"""
+        if events:
+            self.console.print(
+                Group(*(Text(message, style=style) for message, style in events))
+            )
+
+    def _progress(self) -> Progress:
+        """Create the progress display used while separating"""
+        return Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TimeElapsedColumn(),
+            console=self.console,
+        )
+
+    def _release_memory(self):
+        """Drop unreferenced tensors and return cached CUDA blocks to the driver"""
+        gc.collect()
+        if self.device_type == "cuda":
+            torch.cuda.empty_cache()
+
+    def _autocast(self):
+        """Return a reduced-precision autocast context on CUDA, a no-op elsewhere"""
+        if self.device_type != "cuda":
+            return contextlib.nullcontext()
+        # Native bf16 needs Ampere (sm_80) or newer; is_bf16_supported() also
+        # counts emulated bf16, which is slower than fp16 on older cards
+        native_bf16 = torch.cuda.get_device_capability(self.device) >= (8, 0)
+        dtype = torch.bfloat16 if native_bf16 else torch.float16
+        return torch.autocast(device_type="cuda", dtype=dtype)
+
+    def _to_device(self, chunk: torch.Tensor) -> torch.Tensor:
+        """Copy a CPU tensor to the device, asynchronously via pinned memory on CUDA"""
+        shape = chunk.shape
+
+        # Mono expanded to stereo: send one channel and duplicate it on the device
+        mono = shape[-2] > 1 and chunk.stride(-2) == 0
+        if mono:
+            chunk = chunk[..., :1, :]
+
+        on_cuda = self.device_type == "cuda"
+        if on_cuda and not (chunk.is_contiguous() and chunk.is_pinned()):
+            # Stage through a pinned buffer so the copy can use DMA
+            staged = torch.empty(chunk.shape, dtype=chunk.dtype, pin_memory=True)
+            staged.copy_(chunk)
+            chunk = staged
+
+        chunk = chunk.to(self.device, non_blocking=True)
+        if mono:
+            chunk = chunk.expand(shape).contiguous()
+        return chunk
+
+    def _window_size(self, sample_rate: int) -> Tuple[int, int]:
+        """Return (window, overlap) in samples for chunked inference"""
+        window = max(1, int(self.chunk_seconds * sample_rate))
+        overlap = min(int(self.overlap_seconds * sample_rate), window // 2)
+        return window, overlap
+
+    def _separate_stream(
+        self,
+        chunks: Iterable[Tuple[torch.Tensor, int]],
+        length: int,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> Iterator[torch.Tensor]:
+        """
+        Run the model on overlapping windows, yielding finished stems in order
+
+        Only one window is on the device at a time, so peak memory depends on
+        the window length rather than the track length. Neighbouring windows
+        are crossfaded with a raised-cosine ramp over the overlap; samples are
+        yielded as soon as no later window overlaps them.
+
+        Args:
+            chunks: (audio_tensor [batch, 2, n], start_sample) pairs laid out
+                as returned by _window_size, the last one ending at length
+            length: Total number of samples
+            sample_rate: Sample rate of audio
+            on_progress: Called with the completed fraction after each window
+
+        Yields:
+            Consecutive stem segments [batch, 4, 2, n] on the CPU
+        """
+        window, overlap = self._window_size(sample_rate)
+        hop = window - overlap
+
+        # Fade-in ramp, strictly positive so edge samples keep some weight
+        ramp = (torch.arange(overlap) + 0.5) / max(overlap, 1)
+        fade = 0.5 - 0.5 * torch.cos(math.pi * ramp)
+
+        chunks = iter(chunks)
+
+        def prefetch() -> Optional[Tuple[torch.Tensor, int]]:
+            item = next(chunks, None)
+            if item is None:
+                return None
+            chunk, start = item
+            if self.copy_stream is None:
+                return self._to_device(chunk), start
+            with torch.cuda.stream(self.copy_stream):
+                return self._to_device(chunk), start
+
+        # Overlap-added stems and weights that later windows still touch
+        pending = None
+        pending_weight = None
+        pending_start = 0
+
+        next_item = prefetch()
+        while next_item is not None:
+            chunk, start = next_item
+            end = start + chunk.shape[-1]
+            if self.copy_stream is not None:
+                # Wait for this window's copy, and keep its memory alive on
+                # the compute stream
+                compute_stream = torch.cuda.current_stream(self.device)
+                compute_stream.wait_stream(self.copy_stream)
+                chunk.record_stream(compute_stream)
+
+            # Start copying the next window while this one is separated
+            next_item = prefetch()
+
+            # Apply the model
+            with torch.inference_mode(), self._autocast():
+                out = self._apply_model(chunk)
+
+            weight = torch.ones(end - start)
+            if start > 0 and overlap:
+                n = min(overlap, end - start)
+                weight[:n] = fade[:n]
+            if end < length and overlap:
+                weight[-overlap:] = fade.flip(0)
+
+            # Back to float32 after the copy so PCM output stays faithful
+            out = out.cpu().float() * weight
+
+            if pending is None:
+                pending, pending_weight, pending_start = out, weight, start
+            else:
+                # Overlap-add onto the unfinished tail, then append the rest
+                shared = pending_start + pending.shape[-1] - start
+                if shared > 0:
+                    pending[..., -shared:] += out[..., :shared]
+                    pending_weight[-shared:] += weight[:shared]
+                pending = torch.cat([pending, out[..., shared:]], dim=-1)
+                pending_weight = torch.cat([pending_weight, weight[shared:]])
+
+            # Everything before the next window's start is final
+            done = (start + hop if end < length else end) - pending_start
+            finished = pending[..., :done] / pending_weight[:done]
+            pending = pending[..., done:]
+            pending_weight = pending_weight[done:]
+            pending_start += done
+
+            if on_progress is not None:
+                on_progress(end / length)
+
+            yield finished
+
+    def _separate(
+        self,
+        mix: torch.Tensor,
+        sample_rate: int,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> torch.Tensor:
+        """
+        Run the model on a batch of waveforms in overlapping windows
+
+        Args:
+            mix: Tensor of shape [batch, 2, length]
+            sample_rate: Sample rate of audio
+            on_progress: Called with the completed fraction after each window
+
+        Returns:
+            Tensor of separated stems [batch, 4, 2, length] on the CPU
+        """
+        batch, channels, length = mix.shape
+        window, overlap = self._window_size(sample_rate)
+
+        def chunks():
+            for start in range(0, length, window - overlap):
+                yield mix[..., start : start + window], start
+                if start + window >= length:
+                    break
+
+        stems = torch.empty(batch, len(self.model.sources), channels, length)
+        offset = 0
+        for segment in self._separate_stream(
+            chunks(), length, sample_rate, on_progress
+        ):
+            stems[..., offset : offset + segment.shape[-1]] = segment
+            offset += segment.shape[-1]
+
+        return stems
+
+    def _streaming_header(self, audio_file: Path) -> Optional[Tuple[int, int]]:
+        """
+        Check whether a file is long enough to be streamed from disk
+
+        Streaming reads through libsndfile, so files it cannot parse are
+        always loaded whole.
+
+        Args:
+            audio_file: Path to audio file
+
+        Returns:
+            (frames, sample_rate) if the file should be streamed, else None
+        """
+        try:
+            info = sf.info(str(audio_file))
+        except Exception:
+            return None
+        if info.frames > self.streaming_threshold_seconds * info.samplerate:
+            return info.frames, info.samplerate
+        return None
+
+    def _split_streaming(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        filename_base: str,
+        length: int,
+        sample_rate: int,
+        events: List[Tuple[str, str]],
+        on_progress: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Split a long audio file block by block, writing stems as they finish
+
+        Memory use stays constant regardless of track length.
+
+        Args:
+            input_path: Path to input audio file
+            output_dir: Directory to save stems
+            filename_base: Base filename without extension
+            length: Number of samples in the file
+            sample_rate: Sample rate of audio
+            events: Collects (message, style) status lines
+            on_progress: Called with the completed fraction after each window
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        extension = self.output_format.lower()
+
+        outputs = [
+            sf.SoundFile(
+                str(output_dir / f"{filename_base}_{stem_name}.{extension}"),
+                "w",
+                samplerate=sample_rate,
+                channels=2,
+                subtype=self.output_subtype,
+                format=self.output_format,
+            )
+            for stem_name in self.stems_to_save
+        ]
+
+        try:
+            with self._progress() as progress, ThreadPoolExecutor(
+                max_workers=len(outputs)
+            ) as executor:
+
+                task = progress.add_task(
+                    f"🐱‍👻 Streaming {input_path.name} through AI magic...", total=100
+                )
+
+                def report(done: float):
+                    progress.update(task, completed=100 * done)
+                    if on_progress is not None:
+                        on_progress(done)
+
+                chunks = (
+                    (chunk.unsqueeze(0), start)
+                    for chunk, start in self.load_audio_streaming(input_path)
+                )
+                for segment in self._separate_stream(
+                    chunks, length, sample_rate, report
+                ):
+                    # Stems are independent, so write them in parallel
+                    selected = self._select_stems(segment[0]).numpy()
+                    list(
+                        executor.map(
+                            lambda i: outputs[i].write(selected[i].T),
+                            range(len(outputs)),
+                        )
+                    )
+        finally:
+            for output in outputs:
+                output.close()
+
+        for stem_name in self.stems_to_save:
+            events.append((f"💾 Saved: {stem_name}.{extension}", "green"))
+
+    def split_audio(
+        self,
+        input_path: Path,
+        output_dir: Optional[Path] = None,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> bool:
         """
         Split audio file into stems
 
         Args:
             input_path: Path to input audio file
             output_dir: Output directory (defaults to input file directory)
+            on_progress: Called with the completed fraction (0-1) as separation
+                advances, e.g. to drive a GUI progress bar
 
         Returns:
             True if successful, False otherwise
@@ -239,76 +887,318 @@ class GhostKittyStemSplitter:
 
         filename_base = input_path.stem
 
-        self.console.print(f"\n🎵 Processing: {input_path.name}", style="bold cyan")
+        # Status lines are collected and printed together once the file is done
+        events = [(f"\n🎵 Processing: {input_path.name}", "bold cyan")]
 
         try:
             # Load model if not already loaded
             if self.model is None:
                 self.load_model()
 
+            # Very long tracks are streamed instead of loaded whole
+            header = self._streaming_header(input_path)
+            if header is not None:
+                frames, sample_rate = header
+                duration = frames / sample_rate
+                events.append(
+                    (
+                        f"📊 Duration: {duration:.2f}s | Sample Rate: "
+                        f"{sample_rate}Hz | Streaming",
+                        "blue",
+                    )
+                )
+                self._split_streaming(
+                    input_path,
+                    output_dir,
+                    filename_base,
+                    frames,
+                    sample_rate,
+                    events,
+                    on_progress,
+                )
+                events.append(
+                    (f"\n🎉 Success! Stems saved to: {output_dir}", "bold green")
+                )
+                events.append(("🎵 Ready for remixing! 🎧", "bold magenta"))
+                return True
+
             # Load audio
             with self.console.status(
                 "[bold blue]Loading audio file... 📁", spinner="dots"
             ):
                 waveform, sample_rate = self.load_audio(input_path)
                 duration = waveform.shape[1] / sample_rate
-                self.console.print(
-                    f"📊 Duration: {duration:.2f}s | Sample Rate: {sample_rate}Hz",
-                    style="blue",
+                events.append(
+                    (
+                        f"📊 Duration: {duration:.2f}s | Sample Rate: {sample_rate}Hz",
+                        "blue",
+                    )
                 )
 
             # Process with model
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TimeElapsedColumn(),
-                console=self.console,
-            ) as progress:
+            with self._progress() as progress:
 
                 task = progress.add_task(
-                    "🐱‍👻 Separating stems with AI magic...", total=100
+                    f"🐱‍👻 Separating {input_path.name} with AI magic...", total=100
                 )
 
-                # Move audio to device and add batch dimension
-                waveform = waveform.to(self.device).unsqueeze(0)
+                def report(done: float):
+                    progress.update(task, completed=100 * done)
+                    if on_progress is not None:
+                        on_progress(done)
 
-                # Apply the model
-                with torch.no_grad():
-                    stems = apply_model(
-                        self.model, waveform, device=self.device, progress=True
-                    )[
-                        0
-                    ]  # Remove batch dimension
-
-                progress.update(task, completed=100)
+                # Add batch dimension, separate, then remove it again
+                stems = self._separate(waveform.unsqueeze(0), sample_rate, report)[0]
 
             # Save stems
-            self.console.print("\n💾 Saving stems...", style="bold yellow")
-            self.save_stems(stems, sample_rate, output_dir, filename_base)
+            events.append(("\n💾 Saving stems...", "bold yellow"))
+            self.save_stems(stems, sample_rate, output_dir, filename_base, events)
+            del stems, waveform
+            self._release_memory()
 
             # Success message
-            self.console.print(
-                f"\n🎉 Success! Stems saved to: {output_dir}", style="bold green"
-            )
-            self.console.print("🎵 Ready for remixing! 🎧", style="bold magenta")
+            events.append((f"\n🎉 Success! Stems saved to: {output_dir}", "bold green"))
+            events.append(("🎵 Ready for remixing! 🎧", "bold magenta"))
 
             return True
 
         except Exception as e:
-            self.console.print(
-                f"\n❌ Error processing {input_path.name}: {e}", style="bold red"
-            )
+            events.append((f"\n❌ Error processing {input_path.name}: {e}", "bold red"))
             self.logger.error(f"Error processing {input_path}: {e}")
             return False
 
-    def batch_split(self, input_dir: Path, output_dir: Optional[Path] = None) -> int:
+        finally:
+            self._print_events(events)
+
+    def _audio_info(self, audio_file: Path) -> Tuple[int, int]:
+        """Read (frames, sample_rate) from the file header without decoding"""
+        try:
+            info = sf.info(str(audio_file))
+            return info.frames, info.samplerate
+        except Exception:
+            # libsndfile cannot parse every format (e.g. MP3 on older versions)
+            info = torchaudio.info(str(audio_file))
+            return info.num_frames, info.sample_rate
+
+    def _group_for_batching(
+        self, audio_files: List[Path], batch_size: int
+    ) -> List[List[Path]]:
+        """
+        Group audio files that can share a single model call
+
+        Files with the same sample rate are sorted by length and split into
+        runs whose longest file is at most batch_length_ratio times the
+        shortest, so zero-padding to the longest file wastes little compute.
+
+        Args:
+            audio_files: Audio files to group
+            batch_size: Maximum number of files per group
+
+        Returns:
+            List of file groups, each at most batch_size long
+        """
+        by_rate: Dict[int, List[Tuple[int, Path]]] = {}
+        groups = []
+
+        for audio_file in audio_files:
+            try:
+                frames, sample_rate = self._audio_info(audio_file)
+            except Exception:
+                # Unknown layout, process on its own
+                groups.append([audio_file])
+                continue
+            by_rate.setdefault(sample_rate, []).append((frames, audio_file))
+
+        for files in by_rate.values():
+            files.sort(key=lambda item: item[0])
+
+            group: List[Path] = []
+            shortest = 0
+            for frames, audio_file in files:
+                if group and (
+                    len(group) == batch_size
+                    or frames > shortest * self.batch_length_ratio
+                ):
+                    groups.append(group)
+                    group = []
+                if not group:
+                    shortest = frames
+                group.append(audio_file)
+
+            if group:
+                groups.append(group)
+
+        return groups
+
+    def _load_batch(
+        self,
+        audio_files: List[Path],
+        events: Dict[Path, List[Tuple[str, str]]],
+    ) -> List[Tuple[Path, torch.Tensor, int]]:
+        """
+        Load a group of audio files, skipping any that fail
+
+        Args:
+            audio_files: Files sharing a sample rate and similar duration
+            events: Per-file (message, style) status lines to append to
+
+        Returns:
+            List of (path, audio_tensor, sample_rate) for the loaded files
+        """
+        loaded = []
+        for audio_file in audio_files:
+            try:
+                waveform, sample_rate = self.load_audio(audio_file)
+            except Exception as e:
+                events[audio_file].append(
+                    (f"❌ Error loading {audio_file.name}: {e}", "red")
+                )
+                self.logger.error(f"Error loading {audio_file}: {e}")
+                continue
+
+            duration = waveform.shape[1] / sample_rate
+            events[audio_file].append(
+                (
+                    f"\n🎵 {audio_file.name} | Duration: {duration:.2f}s | "
+                    f"Sample Rate: {sample_rate}Hz",
+                    "bold cyan",
+                )
+            )
+            loaded.append((audio_file, waveform, sample_rate))
+
+        return loaded
+
+    def _separate_batch(
+        self,
+        loaded: List[Tuple[Path, torch.Tensor, int]],
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> torch.Tensor:
+        """
+        Separate a group of loaded files with one model call
+
+        Args:
+            loaded: Output of _load_batch. Emptied once its waveforms are
+                stacked, so they are not kept alive during separation.
+            on_progress: Called with the completed fraction after each window
+
+        Returns:
+            Tensor of separated stems [batch, 4, 2, max_length]
+        """
+        # Zero-pad to the longest file and stack into [B, 2, L]
+        max_length = max(waveform.shape[1] for _, waveform, _ in loaded)
+        batched = torch.zeros(len(loaded), 2, max_length)
+        for b, (_, waveform, _) in enumerate(loaded):
+            batched[b, :, : waveform.shape[1]] = waveform
+        sample_rate = loaded[0][2]
+        del waveform
+        loaded.clear()
+
+        return self._separate(batched, sample_rate, on_progress)
+
+    def _save_batch(
+        self,
+        files: List[Tuple[Path, int, int]],
+        stems: torch.Tensor,
+        output_dir: Path,
+        events: Dict[Path, List[Tuple[str, str]]],
+    ) -> List[bool]:
+        """
+        Save the stems of a separated group, trimming each file to its length
+
+        Args:
+            files: (path, length, sample_rate) of each file in the group
+            stems: Output of _separate_batch
+            output_dir: Output directory, each file gets its own subdirectory
+            events: Per-file (message, style) status lines to append to
+
+        Returns:
+            Whether each file was saved successfully
+        """
+        saved = []
+        for b, (audio_file, length, sample_rate) in enumerate(files):
+            file_output_dir = output_dir / audio_file.stem
+            try:
+                self.save_stems(
+                    stems[b, ..., :length],
+                    sample_rate,
+                    file_output_dir,
+                    audio_file.stem,
+                    events[audio_file],
+                )
+            except Exception as e:
+                events[audio_file].append(
+                    (f"❌ Error saving stems for {audio_file.name}: {e}", "red")
+                )
+                self.logger.error(f"Error saving stems for {audio_file}: {e}")
+                saved.append(False)
+                continue
+
+            events[audio_file].append((f"🎉 Stems saved to: {file_output_dir}", "green"))
+            saved.append(True)
+
+        return saved
+
+    def _stream_batch_file(
+        self,
+        audio_file: Path,
+        output_dir: Path,
+        length: int,
+        sample_rate: int,
+        events: List[Tuple[str, str]],
+    ) -> bool:
+        """
+        Stream one long file of a batch, saving into its own subdirectory
+
+        Args:
+            audio_file: Path to audio file
+            output_dir: Batch output directory
+            length: Number of samples in the file
+            sample_rate: Sample rate of audio
+            events: (message, style) status lines to append to
+
+        Returns:
+            True if successful, False otherwise
+        """
+        file_output_dir = output_dir / audio_file.stem
+        events.append(
+            (
+                f"\n🎵 {audio_file.name} | Duration: {length / sample_rate:.2f}s | "
+                f"Sample Rate: {sample_rate}Hz | Streaming",
+                "bold cyan",
+            )
+        )
+        try:
+            self._split_streaming(
+                audio_file,
+                file_output_dir,
+                audio_file.stem,
+                length,
+                sample_rate,
+                events,
+            )
+        except Exception as e:
+            events.append((f"❌ Error processing {audio_file.name}: {e}", "bold red"))
+            self.logger.error(f"Error processing {audio_file}: {e}")
+            return False
+
+        events.append((f"🎉 Stems saved to: {file_output_dir}", "green"))
+        return True
+
+    def batch_split(
+        self, input_dir: Path, output_dir: Optional[Path] = None, batch_size: int = 1
+    ) -> int:
         """
         Split multiple audio files in a directory
 
+        Loading, separation and saving run as a three-stage pipeline: the next
+        group is decoded and the previous group written while the model works
+        on the current one. Tracks longer than streaming_threshold_seconds are
+        streamed from disk one by one afterwards instead.
+
         Args:
             input_dir: Directory containing audio files
             output_dir: Output directory (defaults to input_dir/stems)
+            batch_size: Number of similar-length files to separate per model call
 
         Returns:
             Number of successfully processed files
@@ -317,11 +1207,19 @@ class GhostKittyStemSplitter:
             self.console.print(f"❌ Directory not found: {input_dir}", style="bold red")
             return 0
 
-        # Find audio files
-        audio_files = []
-        for ext in self.supported_formats:
-            audio_files.extend(input_dir.glob(f"*{ext}"))
-            audio_files.extend(input_dir.glob(f"*{ext.upper()}"))
+        if not input_dir.is_dir():
+            self.console.print(f"❌ Not a directory: {input_dir}", style="bold red")
+            return 0
+
+        # Find audio files in one directory pass; matching on the lowercased
+        # suffix also avoids duplicates on case-insensitive filesystems
+        supported_formats = self._SUPPORTED
+        audio_files = [
+            Path(entry.path)
+            for entry in os.scandir(input_dir)
+            if os.path.splitext(entry.name)[1].lower() in supported_formats
+            and entry.is_file()
+        ]
 
         if not audio_files:
             self.console.print("❌ No supported audio files found!", style="bold red")
@@ -334,16 +1232,131 @@ class GhostKittyStemSplitter:
         if output_dir is None:
             output_dir = input_dir / "stems"
 
+        # Very long tracks skip the pipeline, which holds whole decoded
+        # files, and are streamed one by one once it is done
+        streamed = {}
+        batched_files = []
+        for audio_file in audio_files:
+            header = self._streaming_header(audio_file)
+            if header is None:
+                batched_files.append(audio_file)
+            else:
+                streamed[audio_file] = header
+
+        if batch_size > 1:
+            groups = self._group_for_batching(batched_files, batch_size)
+        else:
+            groups = [[audio_file] for audio_file in batched_files]
+
+        try:
+            # Load model before the pipeline starts
+            if self.model is None:
+                self.load_model()
+        except Exception:
+            return 0
+
+        # Status lines per file, printed together once that file is done
+        events: Dict[Path, List[Tuple[str, str]]] = {f: [] for f in audio_files}
         success_count = 0
 
-        for i, audio_file in enumerate(audio_files, 1):
-            self.console.print(
-                f"\n📁 [{i}/{len(audio_files)}] Processing batch...", style="bold cyan"
+        with self._progress() as progress:
+            overall = progress.add_task(
+                "🐱‍👻 Separating stems with AI magic...", total=len(batched_files)
             )
+            tasks = {
+                audio_file: progress.add_task(
+                    f"   {audio_file.name}", total=100, visible=False
+                )
+                for audio_file in batched_files
+            }
 
-            file_output_dir = output_dir / audio_file.stem
-            if self.split_audio(audio_file, file_output_dir):
-                success_count += 1
+            # Files finish on both the main and writer threads
+            finish_lock = threading.Lock()
+
+            def finish(audio_file: Path, ok: bool):
+                nonlocal success_count
+                with finish_lock:
+                    success_count += ok
+                    progress.update(tasks[audio_file], visible=False)
+                    progress.advance(overall)
+                    self._print_events(events[audio_file])
+
+            # Bounded queues keep at most two groups waiting at each stage
+            load_queue = queue.Queue(maxsize=2)
+            save_queue = queue.Queue(maxsize=2)
+
+            def loader():
+                try:
+                    for group in groups:
+                        load_queue.put((group, self._load_batch(group, events)))
+                finally:
+                    load_queue.put(None)
+
+            def writer():
+                while True:
+                    item = save_queue.get()
+                    if item is None:
+                        break
+                    files, stems = item
+                    saved = self._save_batch(files, stems, output_dir, events)
+                    for (audio_file, _, _), ok in zip(files, saved):
+                        finish(audio_file, ok)
+
+            loader_thread = threading.Thread(target=loader, daemon=True)
+            writer_thread = threading.Thread(target=writer, daemon=True)
+            loader_thread.start()
+            writer_thread.start()
+
+            while True:
+                item = load_queue.get()
+                if item is None:
+                    break
+
+                group, loaded = item
+                del item
+                loaded_files = [audio_file for audio_file, _, _ in loaded]
+                for audio_file in group:
+                    if audio_file not in loaded_files:
+                        finish(audio_file, False)
+                if not loaded:
+                    continue
+
+                for audio_file in loaded_files:
+                    progress.update(tasks[audio_file], visible=True)
+
+                def on_progress(done: float):
+                    for audio_file in loaded_files:
+                        progress.update(tasks[audio_file], completed=100 * done)
+
+                # Only lengths go on to the writer, the waveforms are
+                # dropped as soon as they are stacked for the model
+                files = [(f, waveform.shape[1], rate) for f, waveform, rate in loaded]
+                try:
+                    stems = self._separate_batch(loaded, on_progress)
+                except Exception as e:
+                    names = ", ".join(audio_file.name for audio_file in loaded_files)
+                    self.logger.error(f"Error processing {names}: {e}")
+                    for audio_file in loaded_files:
+                        events[audio_file].append(
+                            (f"❌ Error processing {audio_file.name}: {e}", "bold red")
+                        )
+                        finish(audio_file, False)
+                    continue
+
+                save_queue.put((files, stems))
+                del files, stems
+                self._release_memory()
+
+            save_queue.put(None)
+            writer_thread.join()
+
+        # Each streamed file shows its own progress bar, so these run after
+        # the pipeline's display has closed
+        for audio_file, (frames, sample_rate) in streamed.items():
+            success_count += self._stream_batch_file(
+                audio_file, output_dir, frames, sample_rate, events[audio_file]
+            )
+            self._print_events(events[audio_file])
 
         self.console.print(
             f"\n🎯 Batch complete! {success_count}/{len(audio_files)} files processed successfully.",
@@ -353,6 +1366,18 @@ class GhostKittyStemSplitter:
         return success_count
 
 
+def _parse_stems(ctx, param, value: Optional[str]) -> Optional[List[str]]:
+    """Parse the comma-separated --stems option"""
+    if not value:
+        return None
+
+    stems = [name.strip().lower() for name in value.split(",") if name.strip()]
+    try:
+        return GhostKittyStemSplitter.check_stems(stems)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 def create_cli():
     """Create the command-line interface"""
 
@@ -367,16 +1392,54 @@ def create_cli():
         default="htdemucs",
         help="Demucs model to use (htdemucs, htdemucs_ft, mdx_extra)",
     )
-    @click.option("--device", "-d", help="Device to use (cpu, cuda, mps)")
+    @click.option("--device", "-d", help="Device to use (auto, cpu, cuda, mps)")
     @click.option(
         "--batch", "-b", is_flag=True, help="Process all audio files in directory"
     )
+    @click.option(
+        "--batch-size",
+        default=1,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Files to separate per model call in batch mode",
+    )
+    @click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(["wav", "flac"], case_sensitive=False),
+        default="wav",
+        show_default=True,
+        help="Output file format for stems",
+    )
+    @click.option(
+        "--subtype",
+        type=click.Choice(["PCM_16", "PCM_24"], case_sensitive=False),
+        default="PCM_24",
+        show_default=True,
+        help="Output sample encoding (PCM_16 halves file size)",
+    )
+    @click.option(
+        "--stems",
+        "stem_list",
+        callback=_parse_stems,
+        help="Comma-separated stems to save, e.g. vocals,instrumental",
+    )
+    @click.option(
+        "--server",
+        is_flag=True,
+        help="Run through a persistent model server (started if needed)",
+    )
     def cli(
         input_path: Path,
         output: Optional[Path],
         model: str,
         device: Optional[str],
         batch: bool,
+        batch_size: int,
+        output_format: str,
+        subtype: str,
+        stem_list: Optional[List[str]],
+        server: bool,
     ):
         """
         🐱‍👻 GhostKitty StemSplitter - Split audio into 4 stems for remixing!
@@ -385,12 +1448,38 @@ def create_cli():
         """
 
         try:
+            if server:
+                # Reuse the model kept loaded by the server
+                from ghostkitty_server import request_split
+
+                count = request_split(
+                    input_path,
+                    output,
+                    model_name=model,
+                    device=device,
+                    batch=batch,
+                    batch_size=batch_size,
+                    output_format=output_format,
+                    output_subtype=subtype,
+                    stems=stem_list,
+                )
+                print(
+                    f"{Fore.GREEN}🎉 {count} file(s) split by the model server{Style.RESET_ALL}"
+                )
+                return
+
             # Initialize splitter
-            splitter = GhostKittyStemSplitter(model_name=model, device=device)
+            splitter = GhostKittyStemSplitter(
+                model_name=model,
+                device=device,
+                output_format=output_format,
+                output_subtype=subtype,
+                stems=stem_list,
+            )
 
             if batch or input_path.is_dir():
                 # Batch processing
-                splitter.batch_split(input_path, output)
+                splitter.batch_split(input_path, output, batch_size=batch_size)
             else:
                 # Single file processing
                 splitter.split_audio(input_path, output)
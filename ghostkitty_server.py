@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+🐱‍👻 GhostKitty StemSplitter - Model Server
+Keeps Demucs models loaded between CLI runs and splits files on request
+"""
+
+import os
+import secrets
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import click
+
+from ghostkitty import CACHE_DIR, GhostKittyStemSplitter
+
+# Socket, auth key and log live together in the user cache directory
+SERVER_DIR = CACHE_DIR
+AUTHKEY_FILE = SERVER_DIR / "server.key"
+LOG_FILE = SERVER_DIR / "server.log"
+
+
+def server_address() -> str:
+    """Return the address the model server listens on"""
+    if sys.platform == "win32":
+        return r"\\.\pipe\ghostkitty"
+    return str(SERVER_DIR / "server.sock")
+
+
+def _authkey() -> bytes:
+    """Load the shared auth key, creating it on first use"""
+    SERVER_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        # Only the current user may read the key
+        fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return AUTHKEY_FILE.read_bytes()
+    key = secrets.token_hex(32).encode()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def _connect() -> Optional[Connection]:
+    """Connect to a running server, or return None if there is none"""
+    try:
+        return Client(server_address(), authkey=_authkey())
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+
+def _spawn_server():
+    """Start the model server as a detached background process"""
+    SERVER_DIR.mkdir(parents=True, exist_ok=True)
+    log = open(LOG_FILE, "ab")
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve())],
+        stdin=subprocess.DEVNULL,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+        **kwargs,
+    )
+    log.close()
+
+
+def ensure_server(timeout: float = 30.0) -> Connection:
+    """
+    Connect to the model server, starting it if it is not running
+
+    Args:
+        timeout: Seconds to wait for a freshly spawned server
+
+    Returns:
+        Open connection to the server
+    """
+    conn = _connect()
+    if conn is not None:
+        return conn
+
+    _spawn_server()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        conn = _connect()
+        if conn is not None:
+            return conn
+
+    raise RuntimeError(f"Model server did not start, see {LOG_FILE}")
+
+
+def request_split(
+    input_path: Path,
+    output_dir: Optional[Path] = None,
+    model_name: str = "htdemucs",
+    device: Optional[str] = None,
+    batch: bool = False,
+    batch_size: int = 1,
+    output_format: str = "WAV",
+    output_subtype: str = "PCM_24",
+    stems: Optional[List[str]] = None,
+) -> int:
+    """
+    Ask the model server to split a file or directory
+
+    Args:
+        input_path: Audio file or directory to process
+        output_dir: Output directory (defaults as in the CLI)
+        model_name: The Demucs model to use
+        device: Device to run on. Auto-detected by the server if None.
+        batch: Process all audio files in input_path
+        batch_size: Files to separate per model call in batch mode
+        output_format: Container for saved stems ('WAV' or 'FLAC')
+        output_subtype: Sample encoding for saved stems ('PCM_16' or 'PCM_24')
+        stems: Stems to save, all four if None
+
+    Returns:
+        Number of successfully processed files
+    """
+    request = {
+        "command": "split",
+        "input_path": str(input_path.resolve()),
+        "output_dir": str(output_dir.resolve()) if output_dir else None,
+        "model_name": model_name,
+        "device": device,
+        "batch": batch,
+        "batch_size": batch_size,
+        "output_format": output_format,
+        "output_subtype": output_subtype,
+        "stems": stems,
+    }
+
+    with ensure_server() as conn:
+        conn.send(request)
+        reply = conn.recv()
+
+    if "error" in reply:
+        raise RuntimeError(reply["error"])
+    return reply["count"]
+
+
+def serve():
+    """Listen for split requests, keeping each loaded model resident"""
+    models: Dict[Tuple[str, Optional[str]], Any] = {}
+    address = server_address()
+
+    conn = _connect()
+    if conn is not None:
+        conn.close()
+        raise RuntimeError(f"A model server is already listening on {address}")
+
+    # Remove a socket left behind by a server that did not exit cleanly
+    if sys.platform != "win32" and Path(address).exists():
+        Path(address).unlink()
+
+    with Listener(address, authkey=_authkey()) as listener:
+        print(f"🐱‍👻 GhostKitty model server listening on {address}", flush=True)
+
+        while True:
+            with listener.accept() as conn:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    continue
+
+                if request.get("command") == "shutdown":
+                    conn.send({"count": 0})
+                    break
+
+                try:
+                    # A fresh splitter validates this request's options; the
+                    # model an earlier request loaded is handed over to it
+                    key = (request["model_name"], request["device"])
+                    splitter = GhostKittyStemSplitter(
+                        model_name=key[0],
+                        device=key[1],
+                        output_format=request["output_format"],
+                        output_subtype=request["output_subtype"],
+                        stems=request["stems"],
+                    )
+                    splitter.model = models.get(key)
+
+                    input_path = Path(request["input_path"])
+                    output_dir = request["output_dir"]
+                    output_dir = Path(output_dir) if output_dir else None
+
+                    if request["batch"] or input_path.is_dir():
+                        count = splitter.batch_split(
+                            input_path, output_dir, batch_size=request["batch_size"]
+                        )
+                    else:
+                        count = int(splitter.split_audio(input_path, output_dir))
+                    models[key] = splitter.model
+
+                    conn.send({"count": count})
+                except Exception as e:
+                    conn.send({"error": str(e)})
+
+
+def shutdown_server() -> bool:
+    """Stop a running model server, returning False if none was running"""
+    conn = _connect()
+    if conn is None:
+        return False
+    with conn:
+        conn.send({"command": "shutdown"})
+        conn.recv()
+    return True
+
+
+def create_server_cli():
+    """Create the model server command-line interface"""
+
+    @click.command()
+    @click.option("--stop", is_flag=True, help="Stop the running model server")
+    def server_cli(stop: bool):
+        """
+        🐱‍👻 GhostKitty model server - keep Demucs loaded between runs
+
+        Started automatically by `ghostkitty.py --server`.
+        """
+        if stop:
+            if shutdown_server():
+                print("👋 Model server stopped")
+            else:
+                print("⚪ No model server running")
+            return
+
+        try:
+            serve()
+        except KeyboardInterrupt:
+            print("\n👋 Model server stopped")
+
+    return server_cli
+
+
+if __name__ == "__main__":
+    server_cli = create_server_cli()
+    server_cli()
@@ -6,6 +6,7 @@ A user-friendly graphical interface for audio stem separation with bitcrush aest
 
 import math
 import os
+import queue
 import random
 import sys
 import threading
@@ -14,9 +15,13 @@ import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
+import numpy as np
+
 # Add the current directory to Python path to import ghostkitty
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Nothing above may import torch: ghostkitty sets its environment
+# overrides (e.g. the MPS CPU fallback), which torch reads only on import
 try:
     from ghostkitty import GhostKittyStemSplitter
 except ImportError as e:
@@ -27,62 +32,196 @@ except ImportError as e:
 class BitcrushVisualizer:
     """Animated bitcrush-style visualizer for the GUI"""
 
+    # Darker version of each particle color for glow effects
+    _DARKEN = {
+        "#ff006e": "#440022",
+        "#fb5607": "#441100",
+        "#ffbe0b": "#442200",
+        "#8338ec": "#220844",
+        "#3a86ff": "#002244",
+        "#06ffa5": "#002244",
+    }
+
+    # Muted grid line colors, one per brightness level 10-30
+    _GRID_COLORS = [
+        f"#{alpha:02x}{alpha // 2:02x}{min(alpha * 2, 255):02x}"
+        for alpha in range(10, 31)
+    ]
+
+    _NOISE_COLORS = ["#330022", "#220033", "#003322", "#332200", "#002233"]
+
+    # Frame budget for the animation loop (~30 fps)
+    FRAME_MS = 33
+
+    # Rows of five uniform samples prefilled for the bitcrush effects
+    RAND_POOL_ROWS = 2048
+
     def __init__(self, canvas, width, height):
         self.canvas = canvas
         self.width = width
         self.height = height
         self.is_running = False
-        self.particles = []
-        self.waveform = []
+        self.after_job = None
+        self.last_frame_ms = 0
+        self._rng = np.random.default_rng()
+        self._rand_pool = self._rng.random((self.RAND_POOL_ROWS, 5))
+        self._ri = 0
         self.colors = ["#ff006e", "#fb5607", "#ffbe0b", "#8338ec", "#3a86ff", "#06ffa5"]
         self.ghost_eyes = {"x": width // 2, "y": height // 2 - 40, "blink": False}
 
-        # Create initial waveform points
-        for i in range(0, width, 8):
-            self.waveform.append(
-                {
-                    "x": i,
-                    "y": height // 2,
-                    "target_y": height // 2,
-                    "phase": random.uniform(0, math.pi * 2),
-                }
+        # Create initial waveform points, one every 8 pixels
+        self.xs = np.arange(0, width, 8, dtype=np.float32)
+        self.ys = np.full_like(self.xs, height // 2)
+        # Phases stay float64 so adding the large time offset keeps precision.
+        # The per-point step (index * 0.1, i.e. x * 0.0125) is folded in once.
+        self.phases = np.array(
+            [random.uniform(0, math.pi * 2) for _ in range(len(self.xs))]
+        )
+        self.phases += self.xs * 0.0125
+
+        # Create particles, one array per attribute
+        count = 30
+        self.px = np.array(
+            [random.randint(0, width) for _ in range(count)], dtype=np.float32
+        )
+        self.py = np.array(
+            [random.randint(0, height) for _ in range(count)], dtype=np.float32
+        )
+        self.pvx = np.array(
+            [random.uniform(-2, 2) for _ in range(count)], dtype=np.float32
+        )
+        self.pvy = np.array(
+            [random.uniform(-2, 2) for _ in range(count)], dtype=np.float32
+        )
+        self.pcolor_idx = np.array(
+            [random.randrange(len(self.colors)) for _ in range(count)]
+        )
+        self.psize = np.array(
+            [random.randint(2, 6) for _ in range(count)], dtype=np.float32
+        )
+
+        # Canvas items are created once here and mutated every frame, so the
+        # animation never pays for deleting and re-creating them
+        self.create_items()
+
+    def create_items(self):
+        """Create the persistent canvas items, back to front"""
+        self.create_grid()
+
+        # Waveform glow layer and main line, as plain polylines: at 8 px spacing
+        # Tk's per-frame spline subdivision isn't visible
+        points = np.column_stack((self.xs, self.ys)).ravel().tolist()
+        self.wave_ids = [
+            self.canvas.create_line(points, fill=fill, width=width, smooth=False)
+            for fill, width in (("#660044", 10), ("#ff006e", 3))
+        ]
+
+        # Outer glow (darker version of color) and inner particle;
+        # draw_particles moves them into place
+        self.pglow_ids = []
+        self.pdot_ids = []
+        for idx in self.pcolor_idx.tolist():
+            color = self.colors[idx]
+            self.pglow_ids.append(
+                self.canvas.create_oval(
+                    0, 0, 0, 0, fill=self._DARKEN.get(color, "#222222"), outline=""
+                )
+            )
+            self.pdot_ids.append(
+                self.canvas.create_oval(0, 0, 0, 0, fill=color, outline="")
             )
 
-        # Create particles
-        for _ in range(30):
-            self.particles.append(
-                {
-                    "x": random.randint(0, width),
-                    "y": random.randint(0, height),
-                    "vx": random.uniform(-2, 2),
-                    "vy": random.uniform(-2, 2),
-                    "color": random.choice(self.colors),
-                    "size": random.randint(2, 6),
-                    "life": random.uniform(0.5, 1.0),
-                }
+        # Ghost body (glowing layers)
+        x, y = self.ghost_eyes["x"], self.ghost_eyes["y"]
+        for radius, fill in ((70, "#001122"), (60, "#002244"), (50, "#003366")):
+            self.canvas.create_oval(
+                x - radius, y - radius, x + radius, y + radius, fill=fill, outline=""
             )
+        self.eye_ids = [
+            self.canvas.create_oval(0, 0, 0, 0, fill="#ff006e", outline="")
+            for _ in range(2)
+        ]
+        self.mouth_id = self.canvas.create_arc(
+            x - 10,
+            y + 5,
+            x + 10,
+            y + 20,
+            start=0,
+            extent=180,
+            outline="#ff006e",
+            width=2,
+            style="arc",
+        )
+        self.set_blink(False)
+
+        # Fixed pool of glitch rectangles: 5 noise squares then 3 glitch lines,
+        # all tagged so one call can hide the whole pool
+        self.noise_ids = [
+            self.canvas.create_rectangle(
+                0, 0, 0, 0, outline="", state="hidden", tags="glitch"
+            )
+            for _ in range(5)
+        ]
+        self.glitch_ids = [
+            self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#660022", outline="", state="hidden", tags="glitch"
+            )
+            for _ in range(3)
+        ]
+
+        # Toast panel for results, raised above everything when shown
+        self.toast_job = None
+        self.toast_box = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="#0a0a0a", width=2, state="hidden", tags="toast"
+        )
+        self.toast_text = self.canvas.create_text(
+            self.width // 2,
+            self.height // 2,
+            font=("Courier New", 11, "bold"),
+            justify="center",
+            width=self.width - 80,
+            state="hidden",
+            tags="toast",
+        )
+
+    def create_grid(self):
+        """Draw the cyberpunk grid background once; it never changes"""
+        grid_size = 20
+
+        # Vertical lines
+        for x in range(0, self.width, grid_size):
+            color = random.choice(self._GRID_COLORS)
+            self.canvas.create_line(x, 0, x, self.height, fill=color, width=1)
+
+        # Horizontal lines
+        for y in range(0, self.height, grid_size):
+            color = random.choice(self._GRID_COLORS)
+            self.canvas.create_line(0, y, self.width, y, fill=color, width=1)
 
     def start_animation(self):
         """Start the animation loop"""
+        if self.is_running:
+            return
         self.is_running = True
         self.animate()
 
     def stop_animation(self):
         """Stop the animation"""
         self.is_running = False
+        if self.after_job is not None:
+            self.canvas.after_cancel(self.after_job)
+            self.after_job = None
 
     def animate(self):
         """Main animation loop"""
         if not self.is_running:
             return
 
-        self.canvas.delete("all")
+        start = time.perf_counter()
 
-        # Draw grid background
-        self.draw_grid()
-
-        # Draw animated waveform
-        self.draw_waveform()
+        # Draw animated waveform, dropping it for a frame when we fall behind
+        if self.last_frame_ms <= self.FRAME_MS:
+            self.draw_waveform()
 
         # Draw particles
         self.draw_particles()
@@ -93,184 +232,129 @@ class BitcrushVisualizer:
         # Draw bitcrush effects
         self.draw_bitcrush_effects()
 
-        # Schedule next frame
-        self.canvas.after(50, self.animate)
-
-    def draw_grid(self):
-        """Draw cyberpunk grid background"""
-        grid_size = 20
+        # Flush this frame's item changes in one redraw
+        self.canvas.update_idletasks()
 
-        # Vertical lines
-        for x in range(0, self.width, grid_size):
-            alpha = random.randint(10, 30)
-            color = (
-                f"#{alpha:02x}{alpha // 2:02x}{alpha * 2:02x}"
-                if alpha * 2 <= 255
-                else f"#{alpha:02x}{alpha // 2:02x}ff"
-            )
-            self.canvas.create_line(x, 0, x, self.height, fill=color, width=1)
-
-        # Horizontal lines
-        for y in range(0, self.height, grid_size):
-            alpha = random.randint(10, 30)
-            color = (
-                f"#{alpha:02x}{alpha // 2:02x}{alpha * 2:02x}"
-                if alpha * 2 <= 255
-                else f"#{alpha:02x}{alpha // 2:02x}ff"
-            )
-            self.canvas.create_line(0, y, self.width, y, fill=color, width=1)
+        # Schedule next frame, leaving only what is left of the frame budget
+        self.last_frame_ms = int((time.perf_counter() - start) * 1000)
+        self.after_job = self.canvas.after(
+            max(1, self.FRAME_MS - self.last_frame_ms), self.animate
+        )
 
     def draw_waveform(self):
         """Draw animated waveform"""
-        points = []
         time_offset = time.time() * 3
 
-        for i, point in enumerate(self.waveform):
-            # Calculate wave height based on sine wave
-            wave_height = math.sin(point["phase"] + time_offset + i * 0.1) * 30
-            point["target_y"] = self.height // 2 + wave_height
+        # Calculate wave height based on sine wave
+        targets = self.height // 2 + 30 * np.sin(self.phases + time_offset)
 
-            # Smooth interpolation to target
-            point["y"] += (point["target_y"] - point["y"]) * 0.1
+        # Smooth interpolation to target
+        self.ys += (targets - self.ys) * 0.1
 
-            points.extend([point["x"], point["y"]])
+        if len(self.xs) >= 2:
+            points = np.column_stack((self.xs, self.ys)).ravel().tolist()
 
-        if len(points) >= 4:
-            # Draw glow effect (background layers)
-            self.canvas.create_line(points, fill="#330022", width=16, smooth=True)
-            self.canvas.create_line(points, fill="#660044", width=10, smooth=True)
-            self.canvas.create_line(points, fill="#990066", width=6, smooth=True)
-
-            # Draw main waveform
-            self.canvas.create_line(points, fill="#ff006e", width=3, smooth=True)
+            # Glow layers and main line share the same points
+            for line_id in self.wave_ids:
+                self.canvas.coords(line_id, *points)
 
     def draw_particles(self):
         """Draw floating particles"""
-        for particle in self.particles:
-            # Update position
-            particle["x"] += particle["vx"]
-            particle["y"] += particle["vy"]
-
-            # Wrap around screen
-            if particle["x"] < 0:
-                particle["x"] = self.width
-            elif particle["x"] > self.width:
-                particle["x"] = 0
-
-            if particle["y"] < 0:
-                particle["y"] = self.height
-            elif particle["y"] > self.height:
-                particle["y"] = 0
-
-            # Draw particle with glow
-            size = particle["size"]
-            x, y = particle["x"], particle["y"]
-
-            # Outer glow (darker version of color)
-            glow_color = self.darken_color(particle["color"])
-            self.canvas.create_oval(
-                x - size * 2,
-                y - size * 2,
-                x + size * 2,
-                y + size * 2,
-                fill=glow_color,
-                outline="",
-            )
-
-            # Inner particle
-            self.canvas.create_oval(
-                x - size,
-                y - size,
-                x + size,
-                y + size,
-                fill=particle["color"],
-                outline="",
-            )
-
-    def darken_color(self, color):
-        """Convert a color to a darker version for glow effects"""
-        color_map = {
-            "#ff006e": "#440022",
-            "#fb5607": "#441100",
-            "#ffbe0b": "#442200",
-            "#8338ec": "#220844",
-            "#3a86ff": "#002244",
-            "#06ffa5": "#002244",
-        }
-        return color_map.get(color, "#222222")
+        # Update positions, wrapping around the screen
+        self.px += self.pvx
+        self.py += self.pvy
+        np.mod(self.px, self.width, out=self.px)
+        np.mod(self.py, self.height, out=self.py)
+
+        # Draw particles with glow
+        coords = self.canvas.coords
+        for glow_id, dot_id, x, y, size in zip(
+            self.pglow_ids,
+            self.pdot_ids,
+            self.px.tolist(),
+            self.py.tolist(),
+            self.psize.tolist(),
+        ):
+            glow = size * 2
+            coords(glow_id, x - glow, y - glow, x + glow, y + glow)
+            coords(dot_id, x - size, y - size, x + size, y + size)
 
     def draw_ghost_kitty(self):
         """Draw animated ghost kitty face"""
-        x, y = self.ghost_eyes["x"], self.ghost_eyes["y"]
-
         # Randomly blink
         if random.random() < 0.02:
-            self.ghost_eyes["blink"] = not self.ghost_eyes["blink"]
+            self.set_blink(not self.ghost_eyes["blink"])
 
-        # Ghost body (glowing layers)
-        self.canvas.create_oval(
-            x - 70, y - 70, x + 70, y + 70, fill="#001122", outline=""
-        )
-        self.canvas.create_oval(
-            x - 60, y - 60, x + 60, y + 60, fill="#002244", outline=""
-        )
-        self.canvas.create_oval(
-            x - 50, y - 50, x + 50, y + 50, fill="#003366", outline=""
-        )
+    def set_blink(self, blink):
+        """Open or close the ghost kitty's eyes"""
+        x, y = self.ghost_eyes["x"], self.ghost_eyes["y"]
+        self.ghost_eyes["blink"] = blink
 
         # Eyes
-        eye_size = 8 if not self.ghost_eyes["blink"] else 2
-
-        # Left eye
-        self.canvas.create_oval(
-            x - 15, y - eye_size, x - 5, y + eye_size, fill="#ff006e", outline=""
-        )
-
-        # Right eye
-        self.canvas.create_oval(
-            x + 5, y - eye_size, x + 15, y + eye_size, fill="#ff006e", outline=""
-        )
-
-        # Mouth (small smile)
-        if not self.ghost_eyes["blink"]:
-            self.canvas.create_arc(
-                x - 10,
-                y + 5,
-                x + 10,
-                y + 20,
-                start=0,
-                extent=180,
-                outline="#ff006e",
-                width=2,
-                style="arc",
-            )
+        eye_size = 8 if not blink else 2
+        left, right = self.eye_ids
+        self.canvas.coords(left, x - 15, y - eye_size, x - 5, y + eye_size)
+        self.canvas.coords(right, x + 5, y - eye_size, x + 15, y + eye_size)
+
+        # Mouth (small smile) hides while blinking
+        self.canvas.itemconfig(self.mouth_id, state="hidden" if blink else "normal")
+
+    def take_randoms(self, rows):
+        """Take `rows` rows of uniform [0, 1) samples from the prefilled pool"""
+        if self._ri + rows > self.RAND_POOL_ROWS:
+            self._rand_pool = self._rng.random((self.RAND_POOL_ROWS, 5))
+            self._ri = 0
+        values = self._rand_pool[self._ri : self._ri + rows]
+        self._ri += rows
+        return values.tolist()
+
+    def show_toast(self, message, color, duration=4000):
+        """Show a message panel on the canvas, hiding it after `duration` ms"""
+        if self.toast_job is not None:
+            self.canvas.after_cancel(self.toast_job)
+
+        self.canvas.itemconfig(self.toast_text, text=message, fill=color)
+        self.canvas.itemconfig("toast", state="normal")
+
+        # Size the panel around the text
+        x1, y1, x2, y2 = self.canvas.bbox(self.toast_text)
+        self.canvas.coords(self.toast_box, x1 - 12, y1 - 8, x2 + 12, y2 + 8)
+        self.canvas.itemconfig(self.toast_box, outline=color)
+        self.canvas.tag_raise("toast")
+
+        self.toast_job = self.canvas.after(duration, self.hide_toast)
+
+    def hide_toast(self):
+        """Hide the toast panel"""
+        self.toast_job = None
+        self.canvas.itemconfig("toast", state="hidden")
 
     def draw_bitcrush_effects(self):
         """Draw digital distortion effects"""
+        self.canvas.itemconfig("glitch", state="hidden")
+
         # Random digital noise squares
-        for _ in range(5):
-            if random.random() < 0.3:
-                x = random.randint(0, self.width - 20)
-                y = random.randint(0, self.height - 20)
-                size = random.randint(5, 15)
-                color = random.choice(
-                    ["#330022", "#220033", "#003322", "#332200", "#002233"]
-                )
+        noise = self.take_randoms(len(self.noise_ids))
+        for rect_id, (chance, rx, ry, rsize, rcolor) in zip(self.noise_ids, noise):
+            if chance < 0.3:
+                x = int(rx * (self.width - 19))
+                y = int(ry * (self.height - 19))
+                size = 5 + int(rsize * 11)
+                color = self._NOISE_COLORS[int(rcolor * len(self._NOISE_COLORS))]
 
-                self.canvas.create_rectangle(
-                    x, y, x + size, y + size, fill=color, outline=""
-                )
+                self.canvas.coords(rect_id, x, y, x + size, y + size)
+                self.canvas.itemconfig(rect_id, fill=color, state="normal")
 
         # Glitch lines
-        for _ in range(3):
-            if random.random() < 0.1:
-                y = random.randint(0, self.height)
-                width = random.randint(50, 200)
-                x = random.randint(0, self.width - width)
-
-                self.canvas.create_rectangle(
-                    x, y, x + width, y + 2, fill="#660022", outline=""
-                )
+        glitches = self.take_randoms(len(self.glitch_ids))
+        for rect_id, (chance, ry, rwidth, rx, _) in zip(self.glitch_ids, glitches):
+            if chance < 0.1:
+                y = int(ry * (self.height + 1))
+                width = 50 + int(rwidth * 151)
+                x = int(rx * (self.width - width + 1))
+
+                self.canvas.coords(rect_id, x, y, x + width, y + 2)
+                self.canvas.itemconfig(rect_id, state="normal")
 
 
 class GhostKittyStemSplitterGUI:
@@ -306,11 +390,19 @@ class GhostKittyStemSplitterGUI:
         self.model_var = tk.StringVar(value="htdemucs")
         self.device_var = tk.StringVar(value="auto")
 
-        # Splitter instance
+        # Splitter instance, plus one per (model, device) so each model is
+        # only loaded once per session
         self.splitter = None
+        self._splitter_cache = {}
 
         # Animation state
         self.is_processing = False
+        self._flash_job = None
+        self._input_path = None
+
+        # Updates posted by the worker thread, applied on the Tk thread
+        self.worker_events = queue.Queue()
+        self.root.bind("<<WorkerEvent>>", self.on_worker_event)
 
         self.create_widgets()
 
@@ -478,7 +570,7 @@ class GhostKittyStemSplitterGUI:
             variable=self.progress_var,
             maximum=100,
             length=600,
-            mode="indeterminate",
+            mode="determinate",
             style="Cyber.Horizontal.TProgressbar",
         )
         self.progress_bar.pack(pady=20)
@@ -589,15 +681,13 @@ class GhostKittyStemSplitterGUI:
             cursor="hand2",
         )
 
-        # Hover effects
+        # Hover effects (colors resolved once, not on every mouse event)
+        hover_color = (
+            self.colors["button_hover"] if primary else self.colors["bg_tertiary"]
+        )
+
         def on_enter(e):
-            button.config(
-                bg=(
-                    self.colors["button_hover"]
-                    if primary
-                    else self.colors["bg_tertiary"]
-                )
-            )
+            button.config(bg=hover_color)
 
         def on_leave(e):
             button.config(bg=bg_color)
@@ -610,7 +700,7 @@ class GhostKittyStemSplitterGUI:
     def browse_input_file(self):
         """Browse for input audio file"""
         filetypes = [
-            ("Audio Files", "*.mp3 *.wav *.flac *.m4a *.aac *.ogg"),
+            ("Audio Files", "*.mp3 *.wav *.flac *.m4a *.aac *.ogg *.opus *.wma"),
             ("MP3 Files", "*.mp3"),
             ("WAV Files", "*.wav"),
             ("FLAC Files", "*.flac"),
@@ -640,7 +730,8 @@ class GhostKittyStemSplitterGUI:
             color = self.colors["text_dim"]
 
         self.status_label.config(text=message, fg=color)
-        self.root.update()
+        # Repaint the label without dispatching events (no handler re-entry)
+        self.root.update_idletasks()
 
         # Add some visual feedback
         if "ERROR" in message.upper():
@@ -650,9 +741,16 @@ class GhostKittyStemSplitterGUI:
 
     def flash_screen(self, color, duration):
         """Flash the screen with a color for visual feedback"""
-        original_bg = self.root.cget("bg")
+        # A newer flash replaces a pending one instead of stacking callbacks
+        if self._flash_job is not None:
+            self.root.after_cancel(self._flash_job)
         self.root.configure(bg=color)
-        self.root.after(duration, lambda: self.root.configure(bg=original_bg))
+        self._flash_job = self.root.after(duration, self._reset_flash)
+
+    def _reset_flash(self):
+        """Restore the theme background after a flash"""
+        self._flash_job = None
+        self.root.configure(bg=self.colors["bg"])
 
     def start_splitting(self):
         """Start the audio splitting process in a separate thread"""
@@ -665,95 +763,151 @@ class GhostKittyStemSplitterGUI:
             )
             return
 
-        if not Path(input_file).exists():
+        # One stat call; the worker reuses the resulting Path
+        try:
+            os.stat(input_file)
+        except OSError:
             self.update_status("ERROR • FILE NOT FOUND", "#ff0040")
             messagebox.showerror(
                 "SYSTEM ERROR", "Selected file does not exist in the system!"
             )
             return
+        self._input_path = Path(input_file)
+
+        # Pause the visualizer so it doesn't compete with separation for the GIL
+        self.visualizer.stop_animation()
 
         # Visual feedback
         self.is_processing = True
         self.split_button.config(state="disabled", text="🔄 PROCESSING...")
-        self.progress_bar.start()
+        self.progress_var.set(0)
 
         # Update visualizer for processing mode
         self.update_status("INITIALIZING AI SYSTEMS...", self.colors["accent"])
 
+        # Read the settings here; the worker thread must not touch Tk
+        output_dir = self.output_dir_var.get().strip()
+        output_dir = Path(output_dir) if output_dir else None
+        device = self.device_var.get()
+
         # Start splitting in a separate thread
-        thread = threading.Thread(target=self.split_audio_thread)
+        thread = threading.Thread(
+            target=self.split_audio_thread,
+            args=(self._input_path, output_dir, self.model_var.get(), device),
+        )
         thread.daemon = True
         thread.start()
 
-    def split_audio_thread(self):
+    def post_worker_event(self, kind, *args):
+        """Queue a GUI update from the worker thread for the Tk thread"""
+        self.worker_events.put((kind, args))
+        try:
+            self.root.event_generate("<<WorkerEvent>>", when="tail")
+        except tk.TclError:
+            # Window already closed
+            pass
+
+    def on_worker_event(self, event=None):
+        """Apply queued worker updates on the Tk thread"""
+        while True:
+            try:
+                kind, args = self.worker_events.get_nowait()
+            except queue.Empty:
+                return
+
+            if kind == "status":
+                self.update_status(*args)
+            elif kind == "progress":
+                self.progress_var.set(*args)
+            elif kind == "done":
+                self.finish_splitting(*args)
+
+    def split_audio_thread(self, input_path, output_dir, model_name, device):
         """Run audio splitting in a separate thread"""
         try:
-            input_path = Path(self.input_file_var.get().strip())
-            output_dir = None
-
-            if self.output_dir_var.get().strip():
-                output_dir = Path(self.output_dir_var.get().strip())
-
-            # Determine device
-            device = None if self.device_var.get() == "auto" else self.device_var.get()
-
-            self.update_status("LOADING NEURAL NETWORKS... 🤖", self.colors["accent"])
+            # Reuse the splitter (and its loaded model) from an earlier run
+            key = (model_name, device)
+            if key not in self._splitter_cache:
+                self.post_worker_event(
+                    "status", "LOADING NEURAL NETWORKS... 🤖", self.colors["accent"]
+                )
+                self._splitter_cache[key] = GhostKittyStemSplitter(
+                    model_name=model_name, device=device
+                )
+            self.splitter = self._splitter_cache[key]
 
-            # Create splitter
-            self.splitter = GhostKittyStemSplitter(
-                model_name=self.model_var.get(), device=device
+            self.post_worker_event(
+                "status",
+                "AI MODEL LOADED • BEGINNING SEPARATION...",
+                self.colors["accent2"],
             )
 
-            self.update_status(
-                "AI MODEL LOADED • BEGINNING SEPARATION...", self.colors["accent2"]
+            # Split the audio, reporting real progress to the progress bar
+            success = self.splitter.split_audio(
+                input_path,
+                output_dir,
+                lambda done: self.post_worker_event("progress", 100 * done),
             )
+            self.post_worker_event("done", success, None)
 
-            # Split the audio
-            success = self.splitter.split_audio(input_path, output_dir)
+        except Exception as e:
+            self.post_worker_event("done", False, e)
 
-            if success:
+    def finish_splitting(self, success, error):
+        """Report the result of a split and reset the UI (Tk thread only)"""
+        try:
+            if error is not None:
+                self.update_status(f"❌ CRITICAL ERROR: {str(error)}", "#ff0040")
+                self.flash_screen("#ff0040", 300)
+                self.visualizer.show_toast(
+                    f"CRITICAL SYSTEM ERROR\n{str(error)}", "#ff0040", 6000
+                )
+            elif success:
                 self.update_status(
                     "✅ MISSION COMPLETE • STEMS EXTRACTED SUCCESSFULLY", "#06ffa5"
                 )
                 self.flash_screen("#06ffa5", 200)
 
-                messagebox.showinfo(
-                    "MISSION COMPLETE",
-                    "🎉 AUDIO SUCCESSFULLY SEPARATED INTO 4 STEMS!\n\n"
-                    "EXTRACTED COMPONENTS:\n"
-                    "🎤 VOCALS.WAV\n"
-                    "🥁 DRUMS.WAV\n"
-                    "🎸 BASS.WAV\n"
-                    "🎵 OTHER.WAV\n\n"
-                    "STEMS ARE READY FOR REMIX OPERATIONS! �",
+                self.visualizer.show_toast(
+                    "🎉 MISSION COMPLETE • AUDIO SEPARATED INTO 4 STEMS!\n"
+                    "🎤 VOCALS • 🥁 DRUMS • 🎸 BASS • 🎵 OTHER\n"
+                    "STEMS ARE READY FOR REMIX OPERATIONS!",
+                    self.colors["accent3"],
                 )
             else:
                 self.update_status(
                     "❌ PROCESSING FAILED • CHECK SYSTEM LOGS", "#ff0040"
                 )
                 self.flash_screen("#ff0040", 200)
-                messagebox.showerror(
-                    "SYSTEM ERROR",
-                    "Failed to process audio file.\nCheck console for diagnostic information.",
+                self.visualizer.show_toast(
+                    "SYSTEM ERROR • FAILED TO PROCESS AUDIO FILE\n"
+                    "CHECK CONSOLE FOR DIAGNOSTIC INFORMATION",
+                    "#ff0040",
                 )
 
-        except Exception as e:
-            self.update_status(f"❌ CRITICAL ERROR: {str(e)}", "#ff0040")
-            self.flash_screen("#ff0040", 300)
-            messagebox.showerror(
-                "CRITICAL SYSTEM ERROR", f"A critical error occurred:\n{str(e)}"
-            )
-
         finally:
             # Reset UI state
             self.is_processing = False
-            self.progress_bar.stop()
+            if not success:
+                self.progress_var.set(0)
             self.split_button.config(state="normal", text="🐱‍👻 INITIATE STEM SPLIT")
+            self.visualizer.start_animation()
 
     def on_closing(self):
         """Handle window close event"""
         if self.visualizer:
             self.visualizer.stop_animation()
+
+        # Drop the cached models and hand their GPU memory back; CUDA is only
+        # queried if a model ran on it, so a CPU session never initialises it
+        on_cuda = any(s.device_type == "cuda" for s in self._splitter_cache.values())
+        self.splitter = None
+        self._splitter_cache.clear()
+        if on_cuda:
+            import torch
+
+            torch.cuda.empty_cache()
+
         self.root.destroy()
 
     def run(self):
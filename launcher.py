@@ -4,7 +4,7 @@
 Simple launcher for the GhostKitty StemSplitter GUI
 """
 
-import subprocess
+import os
 import sys
 from pathlib import Path
 
@@ -17,15 +17,24 @@ def main():
     print("Launching GUI application...")
 
     # Get the path to the virtual environment Python
-    venv_python = Path(__file__).parent / ".venv" / "bin" / "python"
+    venv_dir = Path(__file__).parent / ".venv"
+    venv_python = venv_dir / "bin" / "python"
 
     # Path to the GUI application
     gui_app = Path(__file__).parent / "ghostkitty_stemsplitter.py"
 
     try:
-        # Launch the GUI
-        subprocess.run([str(venv_python), str(gui_app)], check=True)
-    except subprocess.CalledProcessError as e:
+        if Path(sys.prefix).resolve() == venv_dir.resolve():
+            # Already inside the venv, no need for a second interpreter
+            from ghostkitty_stemsplitter import GhostKittyStemSplitterGUI
+
+            GhostKittyStemSplitterGUI().run()
+        else:
+            # Replace this process with the venv Python (no fork, no wait);
+            # execv skips Python's exit, so flush the banner ourselves
+            sys.stdout.flush()
+            os.execv(str(venv_python), [str(venv_python), str(gui_app)])
+    except OSError as e:
         print(f"❌ Error launching GUI: {e}")
         sys.exit(1)
     except KeyboardInterrupt:
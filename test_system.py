@@ -1,205 +1,357 @@
 #!/usr/bin/env python3
 """
-🐱‍👻 GhostKitty StemSplitter -    try:
-        from ghostkitty import GhostKittyStemSplitter
-
-        print("  ✅ GhostKitty StemSplitter")
-        # Test that the class can be instantiated
-        assert GhostKittyStemSplitter.__name__ == 'GhostKittyStemSplitter'
-    except ImportError as e:em Test
+🐱‍👻 GhostKitty StemSplitter - System Test
 Tests the installation and basic functionality
+
+Run with: pytest
 """
 
+import importlib
+import importlib.metadata
+import importlib.util
 import os
+import py_compile
+import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add current directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
-def test_imports():
-    """Test if all required libraries can be imported"""
-    print("🔍 Testing imports...")
-
-    try:
-        import numpy
-
-        print(f"  ✅ NumPy {numpy.__version__}")
-    except ImportError as e:
-        print(f"  ❌ NumPy: {e}")
-        return False
-
+def _find(name):
+    """Check a module is installed without executing it, for IMPORT_STATUS"""
     try:
-        import torch
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    IMPORT_STATUS[name] = found
+    if not found:
+        IMPORT_ERRORS[name] = f"No module named '{name}'"
 
-        print(f"  ✅ PyTorch {torch.__version__}")
-    except ImportError as e:
-        print(f"  ❌ PyTorch: {e}")
-        return False
 
+def _version(name):
+    """Read a package's version from its metadata, without importing it"""
     try:
-        import librosa
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "(unknown version)"
 
-        print(f"  ✅ LibROSA {librosa.__version__}")
-    except ImportError as e:
-        print(f"  ❌ LibROSA: {e}")
-        return False
 
+def _try_import(name):
+    """Import a module, recording the outcome in IMPORT_STATUS"""
     try:
-        import demucs
-
-        # Use demucs to avoid F401
-        _ = hasattr(demucs, "__version__")
-        print("  ✅ Demucs")
+        module = importlib.import_module(name)
     except ImportError as e:
-        print(f"  ❌ Demucs: {e}")
-        return False
-
-    try:
-        import rich
+        IMPORT_STATUS[name] = False
+        IMPORT_ERRORS[name] = e
+        return None
+    IMPORT_STATUS[name] = True
+    return module
+
+
+# (module, display name, show version, required) for every dependency
+# test_imports checks; a missing optional package is reported but not fatal
+REQUIRED = [
+    ("numpy", "NumPy", True, True),
+    ("torch", "PyTorch", True, True),
+    ("librosa", "LibROSA", True, False),
+    ("demucs", "Demucs", False, True),
+    ("rich", "Rich", False, True),
+    ("ghostkitty", "GhostKitty module", False, True),
+]
+
+# Availability is checked without importing; only the modules the tests
+# actually use are imported, once, here
+IMPORT_STATUS = {}
+IMPORT_ERRORS = {}
+for _name, *_ in REQUIRED:
+    _find(_name)
+# ghostkitty first: it sets torch's environment overrides, which are only
+# read when torch is first imported
+ghostkitty = _try_import("ghostkitty")
+torch = _try_import("torch")
+
+
+# Sample paths for the format check; only the .txt one is unsupported
+TEST_PATHS = tuple(
+    Path(p) for p in ("test.mp3", "test.wav", "test.flac", "test.m4a", "test.txt")
+)
 
-        print("  ✅ Rich")
-        # Use rich to avoid F401
-        _ = hasattr(rich, "print")
-    except ImportError as e:
-        print(f"  ❌ Rich: {e}")
-        return False
 
-    try:
-        from ghostkitty import GhostKittyStemSplitter
+def test_imports():
+    """Test if all required libraries can be imported"""
+    print("🔍 Testing imports...")
 
-        print("  ✅ GhostKitty module")
-        # Use the import to avoid F401
-        assert hasattr(GhostKittyStemSplitter, "__init__")
-    except ImportError as e:
-        print(f"  ❌ GhostKitty module: {e}")
-        return False
+    missing = []
+    for name, label, show_version, required in REQUIRED:
+        if not IMPORT_STATUS[name]:
+            print(f"  {'❌' if required else '⚪'} {label}: {IMPORT_ERRORS[name]}")
+            if required:
+                missing.append(label)
+            continue
+        print(f"  ✅ {label} {_version(name)}" if show_version else f"  ✅ {label}")
 
-    return True
+    assert not missing, f"Missing required packages: {', '.join(missing)}"
 
 
 def test_device_detection():
     """Test device detection"""
-    print("\n🖥️  Testing device detection...")
+    if ghostkitty is None:
+        pytest.skip(f"GhostKitty module unavailable: {IMPORT_ERRORS['ghostkitty']}")
 
-    try:
-        import torch
+    # One probe: CUDA, then MPS, and CPU only once both are ruled out
+    device = ghostkitty.auto_device()
+
+    if device.type == "cuda":
+        print(f"  ✅ CUDA available: {torch.cuda.get_device_name()}")
+    elif device.type == "mps":
+        print("  ✅ MPS (Apple Silicon) available")
+    else:
+        print("  ⚪ CUDA and MPS not available")
+        print("  ✅ CPU always available")
 
-        # Test CUDA
-        if torch.cuda.is_available():
-            print(f"  ✅ CUDA available: {torch.cuda.get_device_name()}")
-        else:
-            print("  ⚪ CUDA not available")
+    assert device.type in ("cuda", "mps", "cpu")
 
-        # Test MPS (Apple Silicon)
-        if hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-            print("  ✅ MPS (Apple Silicon) available")
-        else:
-            print("  ⚪ MPS not available")
 
-        print("  ✅ CPU always available")
+def test_device_keeps_index():
+    """Test a torch.device keeps its index, e.g. cuda:1 is not cuda:0"""
+    if ghostkitty is None:
+        pytest.skip(f"GhostKitty module unavailable: {IMPORT_ERRORS['ghostkitty']}")
 
-    except Exception as e:
-        print(f"  ❌ Device detection error: {e}")
-        return False
+    splitter = ghostkitty.GhostKittyStemSplitter(device=torch.device("cpu", 0))
 
-    return True
+    assert splitter.device == "cpu:0"
+    assert splitter.device_type == "cpu"
 
 
-def test_ghostkitty_init():
+def test_ghostkitty_init(splitter):
     """Test GhostKitty initialization"""
-    print("\n🐱‍👻 Testing GhostKitty initialization...")
+    supported_count = sum(map(splitter.is_supported_format, TEST_PATHS))
+    print(f"  ✅ Format detection working: {supported_count}/4 audio formats supported")
 
-    try:
-        from ghostkitty import GhostKittyStemSplitter
+    assert supported_count == len(TEST_PATHS) - 1
+    assert ".mp3" in splitter.supported_formats
 
-        # Test GhostKitty initialization
-        splitter = GhostKittyStemSplitter(device="cpu")
-        print("  ✅ GhostKitty StemSplitter initialized successfully")
 
-        # Test supported formats
-        test_files = [
-            Path("test.mp3"),
-            Path("test.wav"),
-            Path("test.flac"),
-            Path("test.m4a"),
-            Path("test.txt"),  # Should not be supported
-        ]
+def _cli_help_in_process():
+    """Return ghostkitty's --help text, built and parsed in this interpreter"""
+    # Resilient parsing skips click's print-and-exit on --help
+    cli = ghostkitty.create_cli()
+    with cli.make_context("ghostkitty.py", ["--help"], resilient_parsing=True) as ctx:
+        return ctx.get_help()
 
-        supported_count = 0
-        for test_file in test_files:
-            if splitter.is_supported_format(test_file):
-                supported_count += 1
 
-        print(
-            f"  ✅ Format detection working: {supported_count}/4 audio formats supported"
-        )
+def _cli_help_subprocess():
+    """Return ghostkitty's --help text from a fresh interpreter"""
+    here = os.path.dirname(os.path.abspath(__file__))
 
-        return True
-
-    except Exception as e:
-        print(f"  ❌ GhostKitty initialization error: {e}")
-        return False
+    # Make sure __pycache__ holds ghostkitty's bytecode so the child skips
+    # parsing and compiling it; running it with -m (not as a script path)
+    # is what lets the child use that cached bytecode
+    try:
+        py_compile.compile(os.path.join(here, "ghostkitty.py"), doraise=True)
+    except (OSError, py_compile.PyCompileError):
+        pass
+
+    result = subprocess.run(
+        [sys.executable, "-m", "ghostkitty", "--help"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+        cwd=here,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    return result.stdout
 
 
 def test_cli_help():
     """Test command-line interface"""
-    print("\n💻 Testing CLI...")
+    # The in-process path only needs the click wiring; a second
+    # interpreter is worth its start-up cost only when that fails
+    help_text = None
+    if IMPORT_STATUS["ghostkitty"]:
+        try:
+            help_text = _cli_help_in_process()
+        except Exception as e:
+            print(f"  ⚪ In-process CLI check failed ({e}), trying a subprocess")
+    if help_text is None:
+        help_text = _cli_help_subprocess()
+
+    assert "GhostKitty" in help_text, f"CLI help failed: {help_text}"
+
+
+# Sample rate for the stub model tests; with chunk_seconds=0.1 and
+# overlap_seconds=0.03 each window is 10 samples, overlapping by 3
+STUB_RATE = 100
+
+
+class _StubModel:
+    """Stands in for a Demucs model, only the sources list is read"""
+
+    sources = ["drums", "bass", "other", "vocals"]
+
+
+def _stub_apply_model(model, mix, **kwargs):
+    """Return the mix scaled by (source index + 1) for each source"""
+    scale = torch.arange(1, len(model.sources) + 1, dtype=mix.dtype)
+    return mix.unsqueeze(1) * scale.view(1, -1, 1, 1)
+
+
+@pytest.fixture
+def stub_splitter(monkeypatch):
+    """CPU splitter with the stub model and 10-sample windows"""
+    if ghostkitty is None:
+        pytest.skip(f"GhostKitty module unavailable: {IMPORT_ERRORS['ghostkitty']}")
+
+    monkeypatch.setattr(ghostkitty, "apply_model", _stub_apply_model)
+    splitter = ghostkitty.GhostKittyStemSplitter(
+        device="cpu", stems=list(ghostkitty.GhostKittyStemSplitter.VALID_STEMS)
+    )
+    splitter.model = _StubModel()
+    splitter.chunk_seconds = 0.1
+    splitter.overlap_seconds = 0.03
+    assert splitter._window_size(STUB_RATE) == (10, 3)
+    return splitter
+
+
+# Shorter than a window, exactly one window, one sample past it, and
+# several hops ending on and off a window boundary
+@pytest.mark.parametrize("length", [5, 10, 11, 38, 45])
+def test_separate_reconstructs_input(stub_splitter, length):
+    """Test the overlap-added windows add back up to the model output"""
+    mix = torch.rand(2, 2, length) * 2 - 1
+    progress = []
+
+    stems = stub_splitter._separate(mix, STUB_RATE, progress.append)
+
+    expected = _stub_apply_model(stub_splitter.model, mix)
+    assert torch.allclose(stems, expected, atol=1e-6)
+    assert progress[-1] == 1.0
+
+
+def test_streaming_matches_in_memory(stub_splitter, tmp_path):
+    """Test streaming from disk writes the same samples as loading whole"""
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+
+    # Quiet enough that "instrumental" (6x the mix) does not clip
+    audio = np.random.default_rng(0).uniform(-0.1, 0.1, (45, 2))
+    input_path = tmp_path / "song.wav"
+    sf.write(str(input_path), audio.astype(np.float32), STUB_RATE, subtype="FLOAT")
+
+    stub_splitter.streaming_threshold_seconds = float("inf")
+    assert stub_splitter.split_audio(input_path, tmp_path / "memory")
+    stub_splitter.streaming_threshold_seconds = 0
+    assert stub_splitter.split_audio(input_path, tmp_path / "streamed")
+
+    for stem_name in stub_splitter.stems_to_save:
+        filename = f"song_{stem_name}.wav"
+        memory, _ = sf.read(str(tmp_path / "memory" / filename))
+        streamed, _ = sf.read(str(tmp_path / "streamed" / filename))
+        assert memory.shape == audio.shape
+        assert np.array_equal(streamed, memory), stem_name
+
+
+def test_batch_streams_long_files(stub_splitter, tmp_path, monkeypatch):
+    """Test batch mode streams long files rather than loading them whole"""
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+
+    rng = np.random.default_rng(0)
+    inputs = {}
+    for name, length in (("track", 30), ("mix", 60)):
+        audio = rng.uniform(-0.1, 0.1, (length, 2)).astype(np.float32)
+        sf.write(str(tmp_path / f"{name}.wav"), audio, STUB_RATE, subtype="FLOAT")
+        inputs[name] = audio
+
+    streamed = []
+    split_streaming = stub_splitter._split_streaming
+
+    def record(input_path, *args, **kwargs):
+        streamed.append(input_path.name)
+        return split_streaming(input_path, *args, **kwargs)
+
+    monkeypatch.setattr(stub_splitter, "_split_streaming", record)
+    stub_splitter.streaming_threshold_seconds = 0.5
+
+    count = stub_splitter.batch_split(tmp_path, tmp_path / "stems", batch_size=2)
+
+    assert count == len(inputs)
+    assert streamed == ["mix.wav"]
+    for name, audio in inputs.items():
+        stem, _ = sf.read(str(tmp_path / "stems" / name / f"{name}_vocals.wav"))
+        assert np.allclose(stem, audio * 4, atol=1e-5), name
 
-    try:
-        import subprocess
-
-        result = subprocess.run(
-            [sys.executable, "ghostkitty.py", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if result.returncode == 0 and "GhostKitty" in result.stdout:
-            print("  ✅ CLI help working")
-            return True
-        else:
-            print(f"  ❌ CLI help failed: {result.stderr}")
-            return False
-
-    except Exception as e:
-        print(f"  ❌ CLI test error: {e}")
-        return False
-
-
-def main():
-    """Run all tests"""
-    print("🐱‍👻 GhostKitty StemSplitter - System Test")
-    print("=" * 50)
-
-    all_passed = True
-
-    # Run tests
-    all_passed &= test_imports()
-    all_passed &= test_device_detection()
-    all_passed &= test_ghostkitty_init()
-    all_passed &= test_cli_help()
-
-    print("\n" + "=" * 50)
-
-    if all_passed:
-        print(
-            "🎉 All tests passed! GhostKitty StemSplitter is ready to split some stems!"
-        )
-        print("\n💡 Next steps:")
-        print("   • Add an audio file to this directory")
-        print("   • Run: python ghostkitty.py your_song.mp3")
-        print("   • Or try the GUI: python ghostkitty_stemsplitter.py")
-    else:
-        print("❌ Some tests failed. Check the errors above.")
-        print("\n🔧 Try:")
-        print("   • Reinstalling dependencies: pip install -r requirements.txt")
-        print("   • Checking Python version (3.8+ required)")
 
-    print("\n🐱‍👻 Happy stem splitting!")
+def test_group_for_batching(stub_splitter, monkeypatch):
+    """Test files are grouped by sample rate, length ratio and batch size"""
+    info = {
+        Path("a.wav"): (100, 44100),
+        Path("b.wav"): (101, 44100),
+        Path("c.wav"): (105, 44100),
+        Path("d.wav"): (200, 44100),
+        Path("e.wav"): (100, 48000),
+    }
+
+    def audio_info(audio_file):
+        if audio_file not in info:
+            raise RuntimeError("unreadable header")
+        return info[audio_file]
+
+    monkeypatch.setattr(stub_splitter, "_audio_info", audio_info)
+    files = [Path(name) for name in ("d.wav", "x.wav", "c.wav", "a.wav")]
+    files += [Path(name) for name in ("e.wav", "b.wav")]
+
+    groups = stub_splitter._group_for_batching(files, batch_size=2)
+
+    # Unreadable headers go alone; a+b fill a batch, c fits the ratio but
+    # not the batch, d is too long for c's group and e has its own rate
+    assert groups == [
+        [Path("x.wav")],
+        [Path("a.wav"), Path("b.wav")],
+        [Path("c.wav")],
+        [Path("d.wav")],
+        [Path("e.wav")],
+    ]
+
+
+def test_batch_split(stub_splitter, tmp_path):
+    """Test batched files are padded, separated and trimmed back per file"""
+    np = pytest.importorskip("numpy")
+    sf = pytest.importorskip("soundfile")
+
+    # 30 and 32 samples share a batch, 60 goes alone, broken.wav fails
+    rng = np.random.default_rng(0)
+    inputs = {}
+    for name, length in (("short", 30), ("medium", 32), ("long", 60)):
+        audio = rng.uniform(-0.1, 0.1, (length, 2)).astype(np.float32)
+        sf.write(str(tmp_path / f"{name}.wav"), audio, STUB_RATE, subtype="FLOAT")
+        inputs[name] = audio
+    (tmp_path / "broken.wav").write_bytes(b"not audio")
+
+    count = stub_splitter.batch_split(tmp_path, tmp_path / "stems", batch_size=3)
+
+    assert count == len(inputs)
+    scales = {"drums": 1, "bass": 2, "other": 3, "vocals": 4, "instrumental": 6}
+    for name, audio in inputs.items():
+        for stem_name in stub_splitter.stems_to_save:
+            output = tmp_path / "stems" / name / f"{name}_{stem_name}.wav"
+            stem, _ = sf.read(str(output))
+            assert stem.shape == audio.shape, output.name
+            assert np.allclose(stem, audio * scales[stem_name], atol=1e-5)
+
+
+def test_batch_split_on_file(stub_splitter, tmp_path):
+    """Test batch mode on a single file reports it instead of crashing"""
+    input_path = tmp_path / "song.wav"
+    input_path.write_bytes(b"")
+
+    assert stub_splitter.batch_split(input_path) == 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(pytest.main([__file__, *sys.argv[1:]]))